@@ -8,6 +8,7 @@ from queue import Queue
 
 from bot import app_vars
 from bot.sound_devices import SoundDevice, SoundDeviceType
+from bot.utils import split
 
 if sys.platform == "win32":
     if sys.version_info.major == 3 and sys.version_info.minor >= 8:
@@ -16,6 +17,10 @@ if sys.platform == "win32":
     else:
         os.chdir(app_vars.directory)
 
+from bot.TeamTalk.access_list import AccessList
+from bot.TeamTalk.directory import Directory
+from bot.TeamTalk.message_scheduler import MessageScheduler
+from bot.TeamTalk.status_publisher import Status, StatusPublisher
 from bot.TeamTalk.thread import TeamTalkThread
 from bot.TeamTalk.structs import *
 
@@ -38,41 +43,6 @@ def _str(data: AnyStr) -> AnyStr:
         return str(data, "utf-8")
 
 
-def split(text: str, max_length: int = app_vars.max_message_length) -> List[str]:
-    if len(text) <= max_length:
-        lines = [text]
-    else:
-        lines = [""]
-        for line in text.split("\n"):
-            if len(line) <= max_length:
-                if len(lines[-1]) > 0 and len(lines[-1]) + len(line) + 1 <= max_length:
-                    lines[-1] += "\n" + line
-                elif len(lines) == 1 and len(lines[0]) == 0:
-                    lines[0] = line
-                else:
-                    lines.append(line)
-            else:
-                words = [""]
-                for word in line.split(" "):
-                    if len(word) <= max_length:
-                        if (
-                            len(words[-1]) > 0
-                            and len(words[-1]) + len(word) + 1 <= max_length
-                        ):
-                            words[-1] += " " + word
-                        elif len(words) == 1 and len(words[0]) == 0:
-                            words[0] == word
-                        else:
-                            words.append(word)
-                    else:
-                        chunk = word
-                        for _ in range(0, int(len(chunk) / max_length) + 1):
-                            words.append(chunk[0:max_length])
-                            chunk = chunk[max_length::]
-                lines += words
-    return lines
-
-
 class TeamTalk:
     def __init__(self, bot: Bot) -> None:
         self.config = bot.config.teamtalk
@@ -88,10 +58,25 @@ class TeamTalk:
         self.status = self.default_status
         self.errors_queue: Queue[Error] = Queue()
         self.event_success_queue: Queue[Event] = Queue()
-        self.message_queue: Queue[Message] = Queue()
+        self.message_queue: Queue[Optional[Message]] = Queue()
         self.myself_event_queue: Queue[Event] = Queue()
         self.uploaded_files_queue: Queue[File] = Queue()
+        self.directory = Directory()
+        self.admins = AccessList(self.config.users.admins)
+        self.banned_users = AccessList(self.config.users.banned_users)
         self.thread = TeamTalkThread(bot, self)
+        self.message_scheduler = MessageScheduler(
+            self._send_text_message,
+            self.config.messages_per_second,
+            self.config.message_burst,
+            self.config.max_queued_messages,
+            app_vars.max_message_length,
+        )
+        self.status_publisher = StatusPublisher(
+            self._send_status,
+            self.config.status_update_window,
+            self.config.max_status_updates_per_second,
+        )
         self.reconnect = False
         self.reconnect_attempt = 0
         self.user_account: UserAccount
@@ -99,12 +84,16 @@ class TeamTalk:
     def initialize(self) -> None:
         logging.debug("Initializing TeamTalk")
         self.thread.start()
+        self.message_scheduler.start()
+        self.status_publisher.start()
         self.connect()
         logging.debug("TeamTalk initialized")
 
     def close(self) -> None:
         logging.debug("Closing teamtalk")
         self.thread.close()
+        self.message_scheduler.close()
+        self.status_publisher.close()
         self.disconnect()
         self.state = State.NOT_CONNECTED
         self.tt.closeTeamTalk()
@@ -123,6 +112,7 @@ class TeamTalk:
 
     def disconnect(self) -> None:
         self.tt.disconnect()
+        self.directory.clear()
         self.state = State.NOT_CONNECTED
 
     def login(self) -> None:
@@ -152,19 +142,24 @@ class TeamTalk:
     def send_message(
         self, text: str, user: Optional[User] = None, type: int = 1
     ) -> None:
-        for string in split(text):
-            message = TeamTalkPy.TextMessage()
-            message.nFromUserID = self.tt.getMyUserID()
-            message.nMsgType = type
-            message.szMessage = _str(string)
-            if type == 1:
-                if isinstance(user, int):
-                    message.nToUserID = user
-                else:
-                    message.nToUserID = user.id
-            elif type == 2:
-                message.nChannelID = self.tt.getMyChannelID()
-            self.tt.doTextMessage(message)
+        user_id = None
+        if type == 1:
+            if isinstance(user, int):
+                user_id = user
+            else:
+                user_id = user.id
+        self.message_scheduler.put(type, user_id, split(text))
+
+    def _send_text_message(self, type: int, user_id: Optional[int], text: str) -> None:
+        message = TeamTalkPy.TextMessage()
+        message.nFromUserID = self.tt.getMyUserID()
+        message.nMsgType = type
+        message.szMessage = _str(text)
+        if type == 1:
+            message.nToUserID = user_id
+        elif type == 2:
+            message.nChannelID = self.tt.getMyChannelID()
+        self.tt.doTextMessage(message)
 
     def send_file(self, channel: Union[int, str], file_path: str):
         if isinstance(channel, int):
@@ -198,18 +193,29 @@ class TeamTalk:
 
     def change_status_text(self, text: str) -> None:
         if text:
-            self.status = split(text)[0]
+            self.status = next(split(text))
         else:
-            self.status = split(self.default_status)[0]
-        self.tt.doChangeStatus(self.gender.value, _str(self.status))
+            self.status = next(split(self.default_status))
+        self.publish_status()
 
     def change_gender(self, gender: str) -> None:
         self.gender = UserStatusMode.__members__[gender.upper()]
-        self.tt.doChangeStatus(self.gender.value, _str(self.status))
+        self.publish_status()
+
+    def publish_status(self, force: bool = False) -> None:
+        self.status_publisher.publish((self.gender.value, self.status), force)
+
+    def _send_status(self, status: Status) -> None:
+        self.tt.doChangeStatus(status[0], _str(status[1]))
 
     def get_channel(self, channel_id: int) -> Channel:
-        channel = self.tt.getChannel(channel_id)
-        return self.get_channel_from_obj(channel)
+        channel = self.directory.get_channel(channel_id)
+        if channel:
+            return channel
+        channel = self.get_channel_from_obj(self.tt.getChannel(channel_id))
+        if channel.id and channel.id == channel_id:
+            self.directory.update_channel(channel)
+        return channel
 
     def get_channel_from_obj(self, obj: TeamTalkPy.Channel) -> Channel:
         try:
@@ -265,26 +271,44 @@ class TeamTalk:
         return self.get_channel(self.tt.getMyChannelID())
 
     def get_user(self, id: int) -> User:
-        user = self.tt.getUser(id)
+        user = self.directory.get_user(id)
+        if user:
+            return user
+        user = self.get_user_from_obj(self.tt.getUser(id))
+        if user.id and user.id == id:
+            self.directory.update_user(user)
+        return user
+
+    def get_user_from_obj(self, user: TeamTalkPy.User) -> User:
         gender = UserStatusMode(user.nStatusMode)
+        username = _str(user.szUsername)
+        user_type = UserType(user.uUserType)
         return User(
             user.nUserID,
             _str(user.szNickname),
-            _str(user.szUsername),
+            username,
             _str(user.szStatusMsg),
             gender,
             UserState(user.uUserState),
             self.get_channel(user.nChannelID),
             _str(user.szClientName),
             user.uVersion,
-            self.get_user_account(_str(user.szUsername)),
-            UserType(user.uUserType),
-            True
-            if _str(user.szUsername) in self.config.users.admins or user.uUserType == 2
-            else False,
-            _str(user.szUsername) in self.config.users.banned_users,
+            self.get_user_account(username),
+            user_type,
+            self.is_admin(username, user_type),
+            self.banned_users.match(username, user_type),
         )
 
+    def is_admin(self, username: str, user_type: UserType) -> bool:
+        return user_type == UserType.Admin or self.admins.match(username, user_type)
+
+    def update_users_access(self) -> None:
+        self.admins.update(self.config.users.admins)
+        self.banned_users.update(self.config.users.banned_users)
+        for user in self.directory.users:
+            user.is_admin = self.is_admin(user.username, user.type)
+            user.is_banned = self.banned_users.match(user.username, user.type)
+
     def get_user_account(self, username: str) -> UserAccount:
         return UserAccount(username, "", "", UserType.Null, UserRight.Null, "/")
 
@@ -299,54 +323,7 @@ class TeamTalk:
         )
 
     def get_event(self, obj: TeamTalkPy.TTMessage) -> Event:
-        try:
-            channel = self.get_channel_from_obj(obj.channel)
-        except (UnicodeDecodeError, ValueError):
-            channel = Channel(1, "", "", 0, ChannelType.Default)
-        try:
-            error = self.get_error(obj.clienterrormsg.nErrorNo, obj.nSource)
-        except (UnicodeDecodeError, ValueError):
-            error = Error("", ErrorType.Success, 1)
-        try:
-            file = self.get_file(obj.remotefile)
-        except (UnicodeDecodeError, ValueError):
-            file = File(1, "", channel, 0, "")
-        try:
-            user_account = self.get_user_account_by_tt_obj(obj.useraccount)
-        except (UnicodeDecodeError, ValueError):
-            user_account = UserAccount("", "", "", UserType.Null, UserRight.Null, "")
-        try:
-            user = self.get_user(obj.user.nUserID)
-        except (UnicodeDecodeError, ValueError):
-            user = User(
-                1,
-                "",
-                "",
-                "",
-                UserStatusMode.M,
-                UserState.Null,
-                channel,
-                "",
-                1,
-                user_account,
-                UserType.Null,
-                False,
-                False,
-            )
-        try:
-            message = self.get_message(obj.textmessage)
-        except (UnicodeDecodeError, ValueError):
-            message = Message("", user, channel, MessageType.NONE)
-        return Event(
-            EventType(obj.nClientEvent),
-            obj.nSource,
-            channel,
-            error,
-            file,
-            message,
-            user,
-            user_account,
-        )
+        return Event(EventType(obj.nClientEvent), obj.nSource, obj, self)
 
     def get_input_devices(self) -> List[SoundDevice]:
         devices: List[SoundDevice] = []
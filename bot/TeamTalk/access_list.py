@@ -0,0 +1,50 @@
+from __future__ import annotations
+from fnmatch import translate
+import re
+from typing import FrozenSet, List, Optional, Pattern, Tuple
+
+from bot.TeamTalk.structs import UserType
+
+
+class AccessList:
+    pattern_chars = "*?["
+    type_prefix = "type:"
+
+    def __init__(self, entries: List[str]) -> None:
+        self.update(entries)
+
+    def update(self, entries: List[str]) -> None:
+        usernames: List[str] = []
+        patterns: List[str] = []
+        user_types: List[UserType] = []
+        for entry in entries:
+            if entry.startswith(self.type_prefix):
+                try:
+                    user_types.append(
+                        UserType.__members__[
+                            entry[len(self.type_prefix) :].capitalize()
+                        ]
+                    )
+                    continue
+                except KeyError:
+                    pass
+            if any(char in entry for char in self.pattern_chars):
+                patterns.append(translate(entry))
+            else:
+                usernames.append(entry)
+        # One assignment, so a concurrent match never sees old and new rules mixed
+        self._rules: Tuple[
+            FrozenSet[str], Optional[Pattern[str]], FrozenSet[UserType]
+        ] = (
+            frozenset(usernames),
+            re.compile("|".join(patterns)) if patterns else None,
+            frozenset(user_types),
+        )
+
+    def match(self, username: str, user_type: UserType) -> bool:
+        usernames, pattern, user_types = self._rules
+        return (
+            username in usernames
+            or user_type in user_types
+            or (pattern is not None and pattern.match(username) is not None)
+        )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from threading import Lock
+from typing import Dict, List, Optional
+
+from bot.TeamTalk.structs import Channel, User
+
+
+class Directory:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._users: Dict[int, User] = {}
+        self._users_by_username: Dict[str, Dict[int, User]] = {}
+        self._channels: Dict[int, Channel] = {}
+
+    @property
+    def users(self) -> List[User]:
+        with self._lock:
+            return list(self._users.values())
+
+    def get_user(self, id: int) -> Optional[User]:
+        return self._users.get(id)
+
+    def get_users_by_username(self, username: str) -> List[User]:
+        with self._lock:
+            return list(self._users_by_username.get(username, {}).values())
+
+    def get_channel(self, id: int) -> Optional[Channel]:
+        return self._channels.get(id)
+
+    def update_user(self, user: User) -> None:
+        with self._lock:
+            self._remove_user(user.id)
+            self._users[user.id] = user
+            self._users_by_username.setdefault(user.username, {})[user.id] = user
+
+    def remove_user(self, id: int) -> None:
+        with self._lock:
+            self._remove_user(id)
+
+    def update_channel(self, channel: Channel) -> None:
+        with self._lock:
+            self._channels[channel.id] = channel
+
+    def remove_channel(self, id: int) -> None:
+        with self._lock:
+            self._channels.pop(id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._users_by_username.clear()
+            self._channels.clear()
+
+    def _remove_user(self, id: int) -> None:
+        user = self._users.pop(id, None)
+        if not user:
+            return
+        users = self._users_by_username[user.username]
+        del users[id]
+        if not users:
+            del self._users_by_username[user.username]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from collections import OrderedDict, deque
+import logging
+from threading import Condition, Thread
+import time
+from typing import Callable, Deque, Iterable, Optional, Tuple
+
+
+Recipient = Tuple[int, Optional[int]]
+
+
+class MessageScheduler(Thread):
+    min_messages_per_second = 0.1
+
+    def __init__(
+        self,
+        send: Callable[[int, Optional[int], str], None],
+        messages_per_second: float,
+        burst: int,
+        max_queue_size: int,
+        max_message_length: int,
+    ) -> None:
+        super().__init__(daemon=True)
+        self.name = "MessageScheduler"
+        self.send = send
+        self.messages_per_second = max(
+            messages_per_second, self.min_messages_per_second
+        )
+        self.burst = max(burst, 1)
+        self.max_queue_size = max_queue_size
+        self.max_message_length = max_message_length
+        self.sent = 0
+        self.dropped = 0
+        self._condition = Condition()
+        # Recipients are served in turn, so one long reply does not hold up others
+        self._queues: OrderedDict[Recipient, Deque[str]] = OrderedDict()
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._close = False
+
+    @property
+    def queued(self) -> int:
+        with self._condition:
+            return sum(len(i) for i in self._queues.values())
+
+    def put(
+        self, type: int, user_id: Optional[int], messages: Iterable[str]
+    ) -> None:
+        with self._condition:
+            queue = self._queues.setdefault((type, user_id), deque())
+            for message in messages:
+                # Channel messages still waiting are merged where they fit
+                if type == 2 and queue and self._fits(queue[-1] + "\n" + message):
+                    queue[-1] += "\n" + message
+                elif len(queue) < self.max_queue_size:
+                    queue.append(message)
+                else:
+                    self.dropped += 1
+            if not queue:
+                del self._queues[(type, user_id)]
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._close = True
+            self._condition.notify()
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queues and not self._close:
+                    self._condition.wait()
+                if self._close:
+                    break
+                self._refill_tokens()
+                if self._tokens < 1:
+                    self._condition.wait((1 - self._tokens) / self.messages_per_second)
+                    continue
+                recipient, queue = self._queues.popitem(last=False)
+                message = queue.popleft()
+                if queue:
+                    self._queues[recipient] = queue
+                self._tokens -= 1
+                self.sent += 1
+            try:
+                self.send(recipient[0], recipient[1], message)
+            except Exception:
+                logging.error("", exc_info=True)
+
+    def _fits(self, message: str) -> bool:
+        return len(message.encode("utf-8")) <= self.max_message_length
+
+    def _refill_tokens(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._updated_at) * self.messages_per_second,
+        )
+        self._updated_at = now
@@ -0,0 +1,79 @@
+from __future__ import annotations
+from collections import deque
+import logging
+from threading import Condition, Thread
+import time
+from typing import Callable, Deque, Optional, Tuple
+
+
+Status = Tuple[int, str]
+
+
+class StatusPublisher(Thread):
+    def __init__(
+        self,
+        send: Callable[[Status], None],
+        window: float,
+        max_updates_per_second: int,
+    ) -> None:
+        super().__init__(daemon=True)
+        self.name = "StatusPublisher"
+        self.send = send
+        self.window = window
+        self.max_updates_per_second = max(max_updates_per_second, 1)
+        self.sent = 0
+        self.skipped = 0
+        self._condition = Condition()
+        self._pending: Optional[Status] = None
+        self._close = False
+        self._last_status: Optional[Status] = None
+        self._send_times: Deque[float] = deque()
+
+    def publish(self, status: Status, force: bool = False) -> None:
+        with self._condition:
+            if self._pending:
+                # The update that is still waiting is replaced by this one
+                self.skipped += 1
+            self._pending = status
+            self._condition.notify()
+            if force:
+                self._last_status = None
+
+    def close(self) -> None:
+        with self._condition:
+            self._close = True
+            self._condition.notify()
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._close:
+                    self._condition.wait()
+                # Updates arriving within the window are sent as one
+                deadline = time.monotonic() + self.window
+                while not self._close and time.monotonic() < deadline:
+                    self._condition.wait(deadline - time.monotonic())
+                while not self._close and self._is_rate_limited():
+                    self._condition.wait(self._send_times[0] + 1 - time.monotonic())
+                if self._close:
+                    break
+                status = self._pending
+                self._pending = None
+                if status is None:
+                    continue
+                if status == self._last_status:
+                    self.skipped += 1
+                    continue
+                self._last_status = status
+                self._send_times.append(time.monotonic())
+                self.sent += 1
+            try:
+                self.send(status)
+            except Exception:
+                logging.error("", exc_info=True)
+
+    def _is_rate_limited(self) -> bool:
+        now = time.monotonic()
+        while self._send_times and self._send_times[0] <= now - 1:
+            self._send_times.popleft()
+        return len(self._send_times) >= self.max_updates_per_second
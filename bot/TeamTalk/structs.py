@@ -1,7 +1,13 @@
+from __future__ import annotations
 from enum import Enum, Flag
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 import TeamTalkPy
 
+if TYPE_CHECKING:
+    from bot.TeamTalk import TeamTalk
+
 major, minor, patch, build = TeamTalkPy.ttstr(TeamTalkPy.getVersion()).split(".")
 
 
@@ -376,28 +382,20 @@ class Event:
         self,
         event_type: EventType,
         source: int,
-        channel: Channel,
-        error: Error,
-        file: File,
-        message: Message,
-        user: User,
-        user_account: UserAccount,
+        obj: TeamTalkPy.TTMessage,
+        ttclient: TeamTalk,
     ):
         self.event_type = event_type
         self.source = source
+        self.obj = obj
+        self._ttclient = ttclient
         # ("ttType", INT32),
         # ("uReserved", UINT32),
-        self.channel = channel
-        self.error = error
         # desktop_input
         # ("filetransfer", FileTransfer),
         # ("mediafileinfo", MediaFileInfo),
-        self.file = file
         # ("serverproperties", ServerProperties),
         # ("serverstatistics", ServerStatistics),
-        self.message: Message = message
-        self.user = user
-        self.user_account = user_account
         # ("banneduser", BannedUser),
         # ("bActive", BOOL),
         # ("nBytesRemain", INT32),
@@ -405,3 +403,61 @@ class Event:
         # ("nPayloadSize", INT32),
         # ("nStreamType", INT32),
         # ("audioinputprogress", AudioInputProgress),
+
+    @cached_property
+    def channel(self) -> Channel:
+        try:
+            return self._ttclient.get_channel_from_obj(self.obj.channel)
+        except (UnicodeDecodeError, ValueError):
+            return Channel(1, "", "", 0, ChannelType.Default)
+
+    @cached_property
+    def error(self) -> Error:
+        try:
+            return self._ttclient.get_error(
+                self.obj.clienterrormsg.nErrorNo, self.source
+            )
+        except (UnicodeDecodeError, ValueError):
+            return Error("", ErrorType.Success, 1)
+
+    @cached_property
+    def file(self) -> File:
+        try:
+            return self._ttclient.get_file(self.obj.remotefile)
+        except (UnicodeDecodeError, ValueError):
+            return File(1, "", self.channel, 0, "")
+
+    @cached_property
+    def user_account(self) -> UserAccount:
+        try:
+            return self._ttclient.get_user_account_by_tt_obj(self.obj.useraccount)
+        except (UnicodeDecodeError, ValueError):
+            return UserAccount("", "", "", UserType.Null, UserRight.Null, "")
+
+    @cached_property
+    def user(self) -> User:
+        try:
+            return self._ttclient.get_user_from_obj(self.obj.user)
+        except (UnicodeDecodeError, ValueError):
+            return User(
+                1,
+                "",
+                "",
+                "",
+                UserStatusMode.M,
+                UserState.Null,
+                self.channel,
+                "",
+                1,
+                self.user_account,
+                UserType.Null,
+                False,
+                False,
+            )
+
+    @cached_property
+    def message(self) -> Message:
+        try:
+            return self._ttclient.get_message(self.obj.textmessage)
+        except (UnicodeDecodeError, ValueError):
+            return Message("", self.user, self.channel, MessageType.NONE)
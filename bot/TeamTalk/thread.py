@@ -1,16 +1,18 @@
 from __future__ import annotations
+from collections import Counter
 from importlib.machinery import SourceFileLoader
 import logging
 import os
 from threading import Thread
 import time
-from typing import Any, Callable, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Callable, Dict, Optional, Tuple, TYPE_CHECKING
 from types import ModuleType
 
 
 import types
 import sys
 
+from bot import app_vars
 from bot.TeamTalk.structs import *
 
 if TYPE_CHECKING:
@@ -25,109 +27,156 @@ class TeamTalkThread(Thread):
         self.bot = bot
         self.config = ttclient.config
         self.ttclient = ttclient
+        self.event_counter: Counter[EventType] = Counter()
+        self.events_per_second: Dict[EventType, float] = {}
+        self._event_counter_started_at = time.monotonic()
 
     def run(self) -> None:
         if self.config.event_handling.load_event_handlers:
             self.event_handlers = self.import_event_handlers()
         self._close = False
         while not self._close:
-            event = self.ttclient.get_event(self.ttclient.tt.getMessage())
-            if event.event_type == EventType.NONE:
-                continue
-            elif (
-                event.event_type == EventType.ERROR
-                and self.ttclient.state == State.CONNECTED
-            ):
-                self.ttclient.errors_queue.put(event.error)
-            elif (
-                event.event_type == EventType.SUCCESS
-                and self.ttclient.state == State.CONNECTED
-            ):
-                self.ttclient.event_success_queue.put(event)
-            elif (
-                event.event_type == EventType.USER_TEXT_MESSAGE
-                and event.message.type == MessageType.User
-            ):
-                self.ttclient.message_queue.put(event.message)
-            elif (
-                event.event_type == EventType.FILE_NEW
-                and event.file.username == self.config.username
-                and event.file.channel.id == self.ttclient.channel.id
-            ):
-                self.ttclient.uploaded_files_queue.put(event.file)
-            elif (
-                event.event_type == EventType.CON_FAILED
-                or event.event_type == EventType.CON_LOST
-                or event.event_type == EventType.MYSELF_KICKED
+            msg = self.ttclient.tt.getMessage(app_vars.tt_event_timeout * 1000)
+            # Drain everything the SDK has already queued before waiting again
+            while msg.nClientEvent != EventType.NONE.value and not self._close:
+                self.handle_event(self.ttclient.get_event(msg))
+                self.update_event_statistics()
+                msg = self.ttclient.tt.getMessage(0)
+            self.update_event_statistics()
+
+    def handle_event(self, event: Event) -> None:
+        self.event_counter[event.event_type] += 1
+        self.update_directory(event)
+        if (
+            event.event_type == EventType.ERROR
+            and self.ttclient.state == State.CONNECTED
+        ):
+            self.ttclient.errors_queue.put(event.error)
+        elif (
+            event.event_type == EventType.SUCCESS
+            and self.ttclient.state == State.CONNECTED
+        ):
+            self.ttclient.event_success_queue.put(event)
+        elif (
+            event.event_type == EventType.USER_TEXT_MESSAGE
+            and event.message.type == MessageType.User
+        ):
+            self.ttclient.message_queue.put(event.message)
+        elif (
+            event.event_type == EventType.FILE_NEW
+            and event.file.username == self.config.username
+            and event.file.channel.id == self.ttclient.channel.id
+        ):
+            self.ttclient.uploaded_files_queue.put(event.file)
+        elif (
+            event.event_type == EventType.CON_FAILED
+            or event.event_type == EventType.CON_LOST
+            or event.event_type == EventType.MYSELF_KICKED
+        ):
+            if event.event_type == EventType.CON_FAILED:
+                logging.warning("Connection failed")
+            elif event.event_type == EventType.CON_LOST:
+                logging.warning("Server lost")
+            else:
+                logging.warning("Kicked")
+            self.ttclient.disconnect()
+            if (
+                self.ttclient.reconnect
+                and self.ttclient.reconnect_attempt
+                < self.config.reconnection_attempts
+                or self.config.reconnection_attempts < 0
             ):
-                if event.event_type == EventType.CON_FAILED:
-                    logging.warning("Connection failed")
-                elif event.event_type == EventType.CON_LOST:
-                    logging.warning("Server lost")
-                else:
-                    logging.warning("Kicked")
                 self.ttclient.disconnect()
+                time.sleep(self.config.reconnection_timeout)
+                self.ttclient.connect()
+                self.ttclient.reconnect_attempt += 1
+            else:
+                logging.error("Connection error")
+                sys.exit(1)
+        elif event.event_type == EventType.CON_SUCCESS:
+            self.ttclient.reconnect_attempt = 0
+            self.ttclient.login()
+        elif event.event_type == EventType.ERROR:
+            if self.ttclient.flags & Flags.AUTHORIZED == Flags(0):
+                logging.warning("Login failed")
                 if (
                     self.ttclient.reconnect
                     and self.ttclient.reconnect_attempt
                     < self.config.reconnection_attempts
                     or self.config.reconnection_attempts < 0
                 ):
-                    self.ttclient.disconnect()
                     time.sleep(self.config.reconnection_timeout)
-                    self.ttclient.connect()
-                    self.ttclient.reconnect_attempt += 1
+                    self.ttclient.login()
                 else:
-                    logging.error("Connection error")
+                    logging.error("Login error")
                     sys.exit(1)
-            elif event.event_type == EventType.CON_SUCCESS:
-                self.ttclient.reconnect_attempt = 0
-                self.ttclient.login()
-            elif event.event_type == EventType.ERROR:
-                if self.ttclient.flags & Flags.AUTHORIZED == Flags(0):
-                    logging.warning("Login failed")
-                    if (
-                        self.ttclient.reconnect
-                        and self.ttclient.reconnect_attempt
-                        < self.config.reconnection_attempts
-                        or self.config.reconnection_attempts < 0
-                    ):
-                        time.sleep(self.config.reconnection_timeout)
-                        self.ttclient.login()
-                    else:
-                        logging.error("Login error")
-                        sys.exit(1)
+            else:
+                logging.warning("Failed to join channel")
+                if (
+                    self.ttclient.reconnect
+                    and self.ttclient.reconnect_attempt
+                    < self.config.reconnection_attempts
+                    or self.config.reconnection_attempts < 0
+                ):
+                    time.sleep(self.config.reconnection_timeout)
+                    self.ttclient.join()
                 else:
-                    logging.warning("Failed to join channel")
-                    if (
-                        self.ttclient.reconnect
-                        and self.ttclient.reconnect_attempt
-                        < self.config.reconnection_attempts
-                        or self.config.reconnection_attempts < 0
-                    ):
-                        time.sleep(self.config.reconnection_timeout)
-                        self.ttclient.join()
-                    else:
-                        logging.error("Error joining channel")
-                        sys.exit(1)
-            elif event.event_type == EventType.MYSELF_LOGGEDIN:
-                self.ttclient.user_account = event.user_account
-                self.ttclient.reconnect_attempt = 0
-                self.ttclient.join()
-            elif (
-                event.event_type == EventType.SUCCESS
-                and self.ttclient.state == State.CONNECTING
-            ):
-                self.ttclient.reconnect_attempt = 0
-                self.ttclient.reconnect = True
-                self.ttclient.state = State.CONNECTED
-                self.ttclient.change_status_text(self.ttclient.status)
-            if self.config.event_handling.load_event_handlers:
-                self.run_event_handler(event)
+                    logging.error("Error joining channel")
+                    sys.exit(1)
+        elif event.event_type == EventType.MYSELF_LOGGEDIN:
+            self.ttclient.user_account = event.user_account
+            self.ttclient.reconnect_attempt = 0
+            self.ttclient.join()
+        elif (
+            event.event_type == EventType.SUCCESS
+            and self.ttclient.state == State.CONNECTING
+        ):
+            self.ttclient.reconnect_attempt = 0
+            self.ttclient.reconnect = True
+            self.ttclient.state = State.CONNECTED
+            # The server does not remember the status of a previous session
+            self.ttclient.publish_status(force=True)
+        if self.config.event_handling.load_event_handlers:
+            self.run_event_handler(event)
 
     def close(self) -> None:
         self._close = True
 
+    def update_directory(self, event: Event) -> None:
+        if event.event_type in (
+            EventType.USER_LOGGEDIN,
+            EventType.USER_UPDATE,
+            EventType.USER_JOINED,
+            EventType.USER_LEFT,
+            EventType.STATE_CHANGE,
+        ):
+            user_id = event.obj.user.nUserID
+            if event.user.id == user_id:
+                self.ttclient.directory.update_user(event.user)
+            else:
+                self.ttclient.directory.remove_user(user_id)
+        elif event.event_type == EventType.USER_LOGGEDOUT:
+            self.ttclient.directory.remove_user(event.obj.user.nUserID)
+        elif event.event_type in (EventType.CHANNEL_NEW, EventType.CHANNEL_UPDATE):
+            channel_id = event.obj.channel.nChannelID
+            if event.channel.id == channel_id:
+                self.ttclient.directory.update_channel(event.channel)
+            else:
+                self.ttclient.directory.remove_channel(channel_id)
+        elif event.event_type == EventType.CHANNEL_REMOVE:
+            self.ttclient.directory.remove_channel(event.obj.channel.nChannelID)
+
+    def update_event_statistics(self) -> None:
+        elapsed = time.monotonic() - self._event_counter_started_at
+        if elapsed < app_vars.tt_event_statistics_interval:
+            return
+        self.events_per_second = {
+            event_type: count / elapsed
+            for event_type, count in self.event_counter.items()
+        }
+        self.event_counter.clear()
+        self._event_counter_started_at += elapsed
+
     def get_function_name_by_event_type(self, event_type: EventType) -> str:
         return f"on_{event_type.name.lower()}"
 
@@ -18,8 +18,11 @@ License: Mit License\
 )
 fallback_service = "yt"
 loop_timeout = 0.01
-max_message_length = 256
+# In bytes of UTF-8, TeamTalk's strings hold 512 bytes including the terminator
+max_message_length = 511
+message_wait_timeout = 1
 recents_max_lenth = 32
 tt_event_timeout = 2
+tt_event_statistics_interval = 10
 
 directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+import logging
+import os
 import pickle
+import time
 from collections import deque
-from typing import Any, Dict, List, TYPE_CHECKING
+from threading import Condition, Lock, Thread
+from typing import Any, BinaryIO, Dict, List, Tuple
 
 from bot import app_vars
 from bot.migrators import cache_migrator
+from bot.player.track import Track
 
 import portalocker
 
-if TYPE_CHECKING:
-    from bot.player.track import Track
-
 
 cache_data_type = Dict[str, Any]
 
@@ -19,41 +21,131 @@ cache_data_type = Dict[str, Any]
 class Cache:
     def __init__(self, cache_data: cache_data_type):
         self.cache_version = cache_data["cache_version"] if "cache_version" in cache_data else CacheManager.version
-        self.recents: deque[Track] = (
-            cache_data["recents"]
+        self.journal_generation: int = (
+            cache_data["journal_generation"]
+            if "journal_generation" in cache_data
+            else 0
+        )
+        self.recents: deque[Track] = deque(
+            [Track.from_record(i) for i in cache_data["recents"]]
             if "recents" in cache_data
-            else deque(maxlen=app_vars.recents_max_lenth)
+            else [],
+            maxlen=app_vars.recents_max_lenth,
         )
         self.favorites: Dict[str, List[Track]] = (
-            cache_data["favorites"] if "favorites" in cache_data else {}
+            {
+                username: [Track.from_record(i) for i in tracks]
+                for username, tracks in cache_data["favorites"].items()
+            }
+            if "favorites" in cache_data
+            else {}
         )
 
     @property
     def data(self):
-        return {"cache_version": self.cache_version, "recents": self.recents, "favorites": self.favorites}
+        return {
+            "cache_version": self.cache_version,
+            "journal_generation": self.journal_generation,
+            "recents": [i.get_record() for i in self.recents],
+            "favorites": {
+                username: [i.get_record() for i in tracks]
+                for username, tracks in self.favorites.items()
+            },
+        }
+
+    def add_recent(self, track: Track) -> None:
+        self.recents.append(track)
+
+    def clear_recents(self) -> None:
+        self.recents.clear()
+
+    def add_favorite(self, username: str, track: Track) -> None:
+        if username in self.favorites:
+            self.favorites[username].append(track)
+        else:
+            self.favorites[username] = [track]
+
+    def delete_favorite(self, username: str, index: int) -> None:
+        del self.favorites[username][index]
+
+    def clear_favorites(self) -> None:
+        self.favorites.clear()
 
 
 class CacheManager:
-    version = 1
+    version = 2
+    max_journal_records = 1000
 
-    def __init__(self, file_name: str) -> None:
+    def __init__(self, file_name: str, save_interval: float = 0) -> None:
         self.file_name = file_name
+        self.journal_file_name = file_name + ".journal"
+        self.save_interval = save_interval
+        self._condition = Condition()
+        self._io_lock = Lock()
+        self._pending_records: List[Tuple[int, str, Tuple[Any, ...]]] = []
+        self._closed = False
+        migrated = False
         try:
-            self.data = cache_migrator.migrate(self, self._load())
+            cache_data = self._load()
+            migrated = cache_data.get("cache_version") != self.version
+            self.data = cache_migrator.migrate(self, cache_data)
             self.cache = Cache(self.data)
         except FileNotFoundError:
             self.cache = Cache({})
+            if os.path.isfile(self.journal_file_name):
+                os.remove(self.journal_file_name)
             self._dump(self.cache.data)
+        # Nothing may touch the journal before another bot's lock is ruled out
         self._lock()
+        self.journal_records = self._replay_journal()
+        # Appending keeps replayed records on disk until a snapshot holds them
+        self._journal: BinaryIO = open(self.journal_file_name, "ab")
+        # A migrated cache is written only once it is known to be ours
+        if migrated or self.journal_records:
+            self._compact()
+        else:
+            self._journal.truncate(0)
+        self._writer = Thread(target=self._run_writer, daemon=True)
+        self._writer.name = "CacheWriter"
+        self._writer.start()
 
     def _dump(self, data: cache_data_type):
-        with open(self.file_name, "wb") as f:
+        # A crash while writing must not leave a half-written cache behind
+        temp_file_name = self.file_name + ".tmp"
+        with open(temp_file_name, "wb") as f:
             pickle.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file_name, self.file_name)
 
     def _load(self) -> cache_data_type:
         with open(self.file_name, "rb") as f:
             return pickle.load(f)
 
+    def _replay_journal(self) -> int:
+        records = 0
+        try:
+            with open(self.journal_file_name, "rb") as f:
+                while True:
+                    try:
+                        generation, operation, args = pickle.load(f)
+                    except EOFError:
+                        break
+                    except Exception:
+                        logging.warning("Cache journal is damaged, the rest is skipped")
+                        break
+                    if generation != self.cache.journal_generation:
+                        continue
+                    args = tuple(
+                        Track.from_record(i) if isinstance(i, dict) else i
+                        for i in args
+                    )
+                    getattr(self.cache, operation)(*args)
+                    records += 1
+        except FileNotFoundError:
+            pass
+        return records
+
     def _lock(self):
         self.file_locker = portalocker.Lock(
             self.file_name,
@@ -66,9 +158,86 @@ class CacheManager:
             raise PermissionError()
 
     def close(self):
-        self.file_locker.release()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._writer.join()
+        self.flush()
+        with self._io_lock:
+            self._journal.close()
+            self.file_locker.release()
 
     def save(self):
+        with self._io_lock:
+            self._compact()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._condition:
+                records = self._pending_records
+                self._pending_records = []
+            if not records:
+                return
+            self._journal.write(b"".join(pickle.dumps(i) for i in records))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self.journal_records += len(records)
+            if self.journal_records >= self.max_journal_records:
+                self._compact()
+
+    def _compact(self) -> None:
+        # Only the snapshot is taken under the condition, so changes made
+        # meanwhile wait for memory copies and never for the disk
+        with self._condition:
+            self.cache.journal_generation += 1
+            data = self.cache.data
+            # Records queued against the previous snapshot are already part of it
+            self._pending_records.clear()
         self.file_locker.release()
-        self._dump(self.cache.data)
+        self._dump(data)
         self.file_locker.acquire()
+        self._journal.truncate(0)
+        self._journal.seek(0)
+        self.journal_records = 0
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending_records and not self._closed:
+                    self._condition.wait()
+                # Changes made within the save interval are written together
+                deadline = time.monotonic() + self.save_interval
+                while not self._closed and time.monotonic() < deadline:
+                    self._condition.wait(deadline - time.monotonic())
+                if self._closed:
+                    break
+            try:
+                self.flush()
+            except Exception:
+                logging.error("Cannot write cache changes", exc_info=True)
+
+    def _write(self, operation: str, *args: Any) -> None:
+        with self._condition:
+            getattr(self.cache, operation)(*args)
+            records = tuple(
+                i.get_record() if isinstance(i, Track) else i for i in args
+            )
+            self._pending_records.append(
+                (self.cache.journal_generation, operation, records)
+            )
+            self._condition.notify()
+
+    def add_recent(self, track: Track) -> None:
+        self._write("add_recent", track)
+
+    def clear_recents(self) -> None:
+        self._write("clear_recents")
+
+    def add_favorite(self, username: str, track: Track) -> None:
+        self._write("add_favorite", username, track)
+
+    def delete_favorite(self, username: str, index: int) -> None:
+        self._write("delete_favorite", username, index)
+
+    def clear_favorites(self) -> None:
+        self._write("clear_favorites")
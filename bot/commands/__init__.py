@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+from itertools import chain
 import logging
 import re
-from threading import Thread
-from typing import Any, List, TYPE_CHECKING, Tuple
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Sequence,
+    TYPE_CHECKING,
+    Tuple,
+    TypeVar,
+)
 
 from bot import app_vars, errors
 from bot.TeamTalk.structs import Message, User, UserType
 from bot.commands import admin_commands, user_commands
+from bot.commands.command_executor import CommandExecutor
 from bot.commands.task_processor import TaskProcessor
 
 re_command = re.compile("[a-z]+")
 re_arg_split = re.compile(r"(?<!\\)\|")
+re_page = re.compile(r"p(\d+)")
+
+T = TypeVar("T")
 
 if TYPE_CHECKING:
     from bot import Bot
@@ -22,6 +36,11 @@ class CommandProcessor:
         self.task_processor = TaskProcessor(self)
         self.bot = bot
         self.config = bot.config
+        self.command_executor = CommandExecutor(
+            self._run,
+            self.config.general.command_workers,
+            self.config.general.max_user_command_queue_size,
+        )
         self.config_manager = bot.config_manager
         self.cache = bot.cache
         self.cache_manager = bot.cache_manager
@@ -31,7 +50,9 @@ class CommandProcessor:
         self.ttclient = bot.ttclient
         self.translator = bot.translator
         self.locked = False
-        self.current_command_id = 0
+        # Help lines of user and all commands, built once per language
+        self._help_texts: Dict[str, Tuple[Dict[str, str], List[str], List[str]]] = {}
+        self._help_lock = Lock()
         self.commands_dict = {
             "h": user_commands.HelpCommand,
             "a": user_commands.AboutCommand,
@@ -71,14 +92,25 @@ class CommandProcessor:
             "rs": admin_commands.RestartCommand,
             "q": admin_commands.QuitCommand,
             "gcid": admin_commands.GetChannelIDCommand,
+            "st": admin_commands.StatisticsCommand,
         }
 
     def run(self):
         self.task_processor.start()
+        self.command_executor.start()
+
+    def close(self):
+        self.command_executor.close()
+        self.task_processor.close()
 
     def __call__(self, message: Message) -> None:
-        command_thread = Thread(target=self._run, args=(message,))
-        command_thread.start()
+        if not self.command_executor.submit(message):
+            self.ttclient.send_message(
+                self.translator.translate(
+                    "The bot is busy with your previous commands, please wait"
+                ),
+                message.user,
+            )
 
     def _run(self, message: Message) -> None:
         try:
@@ -86,7 +118,6 @@ class CommandProcessor:
             if self.check_access(message.user, command_name):
                 command_class = self.get_command(command_name, message.user)
                 command = command_class(self)
-                self.current_command_id = id(command)
                 result = command(arg, message.user)
                 if result:
                     self.ttclient.send_message(
@@ -150,21 +181,70 @@ class CommandProcessor:
             raise errors.UnknownCommandError()
 
     def help(self, arg: str, user: User) -> str:
-        if arg:
-            if arg in self.commands_dict:
-                return "{} {}".format(arg, self.commands_dict[arg](self).help)
-            elif user.is_admin and arg in self.admin_commands_dict:
-                return "{} {}".format(arg, self.admin_commands_dict[arg](self).help)
+        help_texts, user_help, admin_help = self._get_help_texts()
+        page = self.parse_page(arg)
+        if arg and not page:
+            if arg in self.commands_dict or (
+                user.is_admin and arg in self.admin_commands_dict
+            ):
+                return help_texts[arg]
             else:
                 return self.translator.translate("Unknown command")
-        else:
-            help_strings: List[str] = []
-            for i in list(self.commands_dict):
-                help_strings.append(self.help(i, user))
-            if user.is_admin:
-                for i in list(self.admin_commands_dict):
-                    help_strings.append(self.help(i, user))
-            return "\n".join(help_strings)
+        return self.format_page(
+            admin_help if user.is_admin else user_help,
+            page or 1,
+            lambda number, text: text,
+        )
+
+    def _get_help_texts(self) -> Tuple[Dict[str, str], List[str], List[str]]:
+        locale = self.translator.get_locale()
+        with self._help_lock:
+            if locale not in self._help_texts:
+                help_texts = {
+                    name: "{} {}".format(name, command_class(self).help)
+                    for name, command_class in chain(
+                        self.commands_dict.items(), self.admin_commands_dict.items()
+                    )
+                }
+                user_help = [help_texts[i] for i in self.commands_dict]
+                self._help_texts[locale] = (
+                    help_texts,
+                    user_help,
+                    user_help + [help_texts[i] for i in self.admin_commands_dict],
+                )
+            return self._help_texts[locale]
+
+    def parse_page(self, arg: str) -> int:
+        """Returns the page number requested as pNUMBER or 0 for other arguments."""
+        match = re_page.fullmatch(arg.strip().lower())
+        return int(match.group(1)) if match else 0
+
+    def format_page(
+        self, items: Sequence[T], page: int, format_item: Callable[[int, T], str]
+    ) -> str:
+        """Formats one page of items, format_item gets each item with its number.
+
+        Only the items of the page are formatted, so a page of a long list is
+        as cheap to send as a page of a short one.
+        """
+        page_size = self.config.general.page_size
+        pages = max((len(items) + page_size - 1) // page_size, 1)
+        if page < 1 or page > pages:
+            return self.translator.translate("Out of list")
+        start = (page - 1) * page_size
+        lines = [
+            format_item(number, item)
+            for number, item in enumerate(
+                items[start : start + page_size], start + 1
+            )
+        ]
+        if pages > 1:
+            lines.append(
+                self.translator.translate("Page {page} of {pages}").format(
+                    page=page, pages=pages
+                )
+            )
+        return "\n".join(lines)
 
     def parse_command(self, text: str) -> Tuple[str, str]:
         text = text.strip()
@@ -8,6 +8,7 @@ from queue import Empty
 
 from bot.commands.command import Command
 from bot.player.enums import State
+from bot.services.yt import YtService
 from bot import app_vars, errors
 
 if TYPE_CHECKING:
@@ -106,17 +107,14 @@ class ClearCacheCommand(Command):
 
     def __call__(self, arg: str, user: User) -> Optional[str]:
         if not arg:
-            self.cache.recents.clear()
-            self.cache.favorites.clear()
-            self.cache_manager.save()
+            self.cache_manager.clear_recents()
+            self.cache_manager.clear_favorites()
             return self.translator.translate("Cache cleared")
         elif arg == "r":
-            self.cache.recents.clear()
-            self.cache_manager.save()
+            self.cache_manager.clear_recents()
             return self.translator.translate("Recents cleared")
         elif arg == "f":
-            self.cache.favorites.clear()
-            self.cache_manager.save()
+            self.cache_manager.clear_favorites()
             return self.translator.translate("Favorites cleared")
 
 
@@ -301,12 +299,14 @@ class AdminUsersCommand(Command):
         if arg:
             if arg[0] == "+":
                 self.config.teamtalk.users.admins.append(arg[1::])
+                self.ttclient.update_users_access()
                 return self.translator.translate("Added")
             elif arg[0] == "-":
                 try:
                     del self.config.teamtalk.users.admins[
                         self.config.teamtalk.users.admins.index(arg[1::])
                     ]
+                    self.ttclient.update_users_access()
                     return self.translator.translate("Deleted")
                 except ValueError:
                     return self.translator.translate(
@@ -333,12 +333,14 @@ class BannedUsersCommand(Command):
         if arg:
             if arg[0] == "+":
                 self.config.teamtalk.users.banned_users.append(arg[1::])
+                self.ttclient.update_users_access()
                 return self.translator.translate("Added")
             elif arg[0] == "-":
                 try:
                     del self.config.teamtalk.users.banned_users[
                         self.config.teamtalk.users.banned_users.index(arg[1::])
                     ]
+                    self.ttclient.update_users_access()
                     return self.translator.translate("Deleted")
                 except ValueError:
                     return self.translator.translate("This user is not banned")
@@ -383,3 +385,121 @@ class GetChannelIDCommand(Command):
 
     def __call__(self, arg: str, user: User) -> Optional[str]:
         return str(self.ttclient.channel.id)
+
+
+class StatisticsCommand(Command):
+    @property
+    def help(self) -> str:
+        return self.translator.translate("Shows bot's performance statistics")
+
+    def __call__(self, arg: str, user: User) -> Optional[str]:
+        command_executor = self.command_processor.command_executor
+        statistics = [
+            self.translator.translate(
+                "Commands: {active_workers} of {max_workers} workers active, {queue_depth} queued"
+            ).format(
+                active_workers=command_executor.active_workers,
+                max_workers=command_executor.max_workers,
+                queue_depth=command_executor.queue_depth,
+            )
+        ]
+        for task_queue in self.command_processor.task_processor.task_queues.values():
+            completed = task_queue.completed if task_queue.completed else 1
+            statistics.append(
+                self.translator.translate(
+                    "Tasks {key}: {completed} done, {queued} queued, {cancelled} cancelled, average wait {queue_time:.3f} s, average run {run_time:.3f} s"
+                ).format(
+                    key=task_queue.key.value,
+                    completed=task_queue.completed,
+                    queued=len(task_queue),
+                    cancelled=task_queue.cancelled,
+                    queue_time=task_queue.queue_time / completed,
+                    run_time=task_queue.run_time / completed,
+                )
+            )
+        statistics.append(
+            self.translator.translate(
+                "Gaps between tracks: last {last_gap_time:.3f} s, average {gap_time:.3f} s"
+            ).format(
+                last_gap_time=self.player.last_gap_time,
+                gap_time=self.player.gap_time / self.player.gaps
+                if self.player.gaps
+                else 0,
+            )
+        )
+        stream_cache = self.service_manager.stream_cache
+        statistics.append(
+            self.translator.translate(
+                "Stream URL cache: {hits} hits, {misses} misses, {size} of {max_size} entries"
+            ).format(
+                hits=stream_cache.hits,
+                misses=stream_cache.misses,
+                size=len(stream_cache),
+                max_size=stream_cache.max_size,
+            )
+        )
+        yt_service = self.service_manager.services["yt"]
+        if isinstance(yt_service, YtService) and yt_service.is_enabled:
+            info_cache = yt_service.info_cache
+            requests = info_cache.hits + info_cache.misses
+            statistics.append(
+                self.translator.translate(
+                    "YouTube playlist cache: {hit_rate:.0f}% hit rate, {hits} hits, {misses} misses, {size} of {max_size} entries"
+                ).format(
+                    hit_rate=info_cache.hits / requests * 100 if requests else 0,
+                    hits=info_cache.hits,
+                    misses=info_cache.misses,
+                    size=len(info_cache),
+                    max_size=info_cache.max_size,
+                )
+            )
+            statistics.append(
+                self.translator.translate(
+                    "YoutubeDL instances: {created} created, {pooled} of {pool_size} pooled"
+                ).format(
+                    created=yt_service.ydl_created,
+                    pooled=yt_service.ydl_pooled,
+                    pool_size=yt_service.ydl_pool_size,
+                )
+            )
+        search_cache = self.service_manager.search_cache
+        statistics.append(
+            self.translator.translate(
+                "Search cache: {hits} hits, {misses} misses, {size} of {max_size} entries"
+            ).format(
+                hits=search_cache.hits,
+                misses=search_cache.misses,
+                size=len(search_cache),
+                max_size=search_cache.max_size,
+            )
+        )
+        message_scheduler = self.ttclient.message_scheduler
+        statistics.append(
+            self.translator.translate(
+                "Messages: {queued} queued, {sent} sent, {dropped} dropped"
+            ).format(
+                queued=message_scheduler.queued,
+                sent=message_scheduler.sent,
+                dropped=message_scheduler.dropped,
+            )
+        )
+        status_publisher = self.ttclient.status_publisher
+        statistics.append(
+            self.translator.translate(
+                "Status updates: {sent} sent, {skipped} skipped"
+            ).format(sent=status_publisher.sent, skipped=status_publisher.skipped)
+        )
+        events_per_second = self.ttclient.thread.events_per_second
+        statistics.append(
+            self.translator.translate("TeamTalk events per second: {events}").format(
+                events=", ".join(
+                    "{name} {rate:.1f}".format(name=event_type.name, rate=rate)
+                    for event_type, rate in sorted(
+                        events_per_second.items(), key=lambda i: i[1], reverse=True
+                    )
+                )
+                if events_per_second
+                else "0"
+            )
+        )
+        return "\n".join(statistics)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any, TYPE_CHECKING, Callable
 
-from bot.commands.task_processor import Task
+from bot.commands.task_processor import Task, TaskKey
 
 if TYPE_CHECKING:
     from bot.commands import CommandProcessor
@@ -27,5 +27,7 @@ class Command:
     def help(self) -> str:
         return self.translator.translate("help text not found")
 
-    def run_async(self, func: Callable[..., None], *args: Any, **kwargs: Any) -> None:
-        self._task_processor.task_queue.put(Task(id(self), func, args, kwargs))
+    def run_async(
+        self, key: TaskKey, func: Callable[..., None], *args: Any, **kwargs: Any
+    ) -> None:
+        self._task_processor.put(Task(id(self), key, func, args, kwargs))
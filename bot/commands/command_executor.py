@@ -0,0 +1,78 @@
+from __future__ import annotations
+from collections import deque
+import logging
+from threading import Lock, Thread
+from queue import Queue
+from typing import Callable, Deque, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bot.TeamTalk.structs import Message
+
+
+class CommandExecutor:
+    def __init__(
+        self,
+        function: Callable[[Message], None],
+        max_workers: int,
+        max_user_queue_size: int,
+    ) -> None:
+        self.function = function
+        self.max_workers = max_workers if max_workers > 0 else 1
+        self.max_user_queue_size = max_user_queue_size
+        self.active_workers = 0
+        self._lock = Lock()
+        self._user_queues: Dict[int, Deque[Message]] = {}
+        self._ready_queue: Queue[Optional[int]] = Queue()
+        self._workers: List[Thread] = []
+
+    def start(self) -> None:
+        for i in range(self.max_workers):
+            worker = Thread(target=self._work)
+            worker.name = "CommandWorker-{}".format(i)
+            worker.start()
+            self._workers.append(worker)
+
+    def close(self) -> None:
+        for _ in self._workers:
+            self._ready_queue.put(None)
+
+    def submit(self, message: Message) -> bool:
+        user_id = message.user.id
+        with self._lock:
+            if user_id in self._user_queues:
+                user_queue = self._user_queues[user_id]
+                if len(user_queue) >= self.max_user_queue_size:
+                    return False
+                user_queue.append(message)
+            else:
+                self._user_queues[user_id] = deque([message])
+                self._ready_queue.put(user_id)
+        return True
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return sum(len(i) for i in self._user_queues.values())
+
+    def _work(self) -> None:
+        while True:
+            user_id = self._ready_queue.get()
+            if user_id is None:
+                break
+            with self._lock:
+                self.active_workers += 1
+            # The user's queue stays registered while a worker drains it, so
+            # another worker never picks up the same user and order is kept.
+            while True:
+                with self._lock:
+                    user_queue = self._user_queues[user_id]
+                    if not user_queue:
+                        del self._user_queues[user_id]
+                        break
+                    message = user_queue.popleft()
+                try:
+                    self.function(message)
+                except Exception:
+                    logging.error("", exc_info=True)
+            with self._lock:
+                self.active_workers -= 1
@@ -1,30 +1,116 @@
 from __future__ import annotations
-from threading import Thread
-from queue import Queue
-from typing import TYPE_CHECKING, Any, Callable
+from collections import deque
+from enum import Enum
+import logging
+from threading import Condition, Thread
+import time
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Optional
 
 if TYPE_CHECKING:
     from bot.commands import CommandProcessor
 
 
+class TaskKey(Enum):
+    Player = "player"
+    Messaging = "messaging"
+    Download = "download"
+
+
 class Task:
     def __init__(
-        self, command_id: int, function: Callable[..., None], args: Any, kwargs: Any
+        self,
+        command_id: int,
+        key: TaskKey,
+        function: Callable[..., None],
+        args: Any,
+        kwargs: Any,
     ) -> None:
         self.command_id = command_id
+        self.key = key
         self.function = function
         self.args = args
         self.kwargs = kwargs
+        self.queued_at = time.monotonic()
 
 
-class TaskProcessor(Thread):
-    def __init__(self, command_processor: CommandProcessor) -> None:
+class TaskQueue(Thread):
+    def __init__(self, key: TaskKey) -> None:
         super().__init__(daemon=True)
-        self.command_processor = command_processor
-        self.task_queue: Queue[Task] = Queue()
+        self.name = "TaskQueue-{}".format(key.value)
+        self.key = key
+        self.completed = 0
+        self.cancelled = 0
+        self.queue_time = 0.0
+        self.run_time = 0.0
+        self._condition = Condition()
+        self._tasks: Deque[Task] = deque()
+        self._close = False
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def put(self, task: Task) -> None:
+        with self._condition:
+            self._tasks.append(task)
+            self._condition.notify()
+
+    def cancel(self, keep_command_id: Optional[int] = None) -> int:
+        with self._condition:
+            tasks = [i for i in self._tasks if i.command_id == keep_command_id]
+            cancelled = len(self._tasks) - len(tasks)
+            self._tasks = deque(tasks)
+            self.cancelled += cancelled
+        return cancelled
+
+    def close(self) -> None:
+        with self._condition:
+            self._close = True
+            self._condition.notify()
 
     def run(self) -> None:
         while True:
-            task = self.task_queue.get()
-            if task.command_id == self.command_processor.current_command_id:
+            with self._condition:
+                while not self._tasks and not self._close:
+                    self._condition.wait()
+                if self._close:
+                    break
+                task = self._tasks.popleft()
+            started_at = time.monotonic()
+            try:
                 task.function(*task.args, **task.kwargs)
+            except Exception:
+                logging.error("", exc_info=True)
+            finished_at = time.monotonic()
+            with self._condition:
+                self.completed += 1
+                self.queue_time += started_at - task.queued_at
+                self.run_time += finished_at - started_at
+
+
+class TaskProcessor:
+    superseding_keys = (TaskKey.Player,)
+
+    def __init__(self, command_processor: CommandProcessor) -> None:
+        self.command_processor = command_processor
+        self.task_queues: Dict[TaskKey, TaskQueue] = {
+            key: TaskQueue(key) for key in TaskKey
+        }
+
+    def start(self) -> None:
+        for task_queue in self.task_queues.values():
+            task_queue.start()
+
+    def close(self) -> None:
+        for task_queue in self.task_queues.values():
+            task_queue.close()
+
+    def put(self, task: Task) -> None:
+        task_queue = self.task_queues[task.key]
+        # A newer command's player task makes queued player tasks of older
+        # commands obsolete, other keys keep everything they were given.
+        if task.key in self.superseding_keys:
+            task_queue.cancel(keep_command_id=task.command_id)
+        task_queue.put(task)
+
+    def cancel(self, key: TaskKey) -> int:
+        return self.task_queues[key].cancel()
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Optional, TYPE_CHECKING
 
 from bot.commands.command import Command
+from bot.commands.task_processor import TaskKey
 from bot.player.enums import Mode, State, TrackType
 from bot.TeamTalk.structs import User, UserRight
 from bot import errors, app_vars
@@ -13,7 +14,10 @@ if TYPE_CHECKING:
 class HelpCommand(Command):
     @property
     def help(self) -> str:
-        return self.translator.translate("Shows command help")
+        return "{}. {}".format(
+            self.translator.translate("Shows command help"),
+            self.translator.translate("pNUMBER shows the page with the given number"),
+        )
 
     def __call__(self, arg: str, user: User) -> Optional[str]:
         return self.command_processor.help(arg, user)
@@ -38,21 +42,23 @@ class PlayPauseCommand(Command):
     def __call__(self, arg: str, user: User) -> Optional[str]:
         if arg:
             self.run_async(
+                TaskKey.Messaging,
                 self.ttclient.send_message,
                 self.translator.translate("Searching..."),
                 user,
             )
             try:
-                track_list = self.service_manager.service.search(arg)
+                track_list = self.service_manager.service.search_cached(arg)
                 if self.config.general.send_channel_messages:
                     self.run_async(
+                        TaskKey.Messaging,
                         self.ttclient.send_message,
                         self.translator.translate(
                             "{nickname} requested {request}"
                         ).format(nickname=user.nickname, request=arg),
                         type=2,
                     )
-                self.run_async(self.player.play, track_list)
+                self.run_async(TaskKey.Player, self.player.play, track_list)
                 return self.translator.translate("Playing {}").format(
                     track_list[0].name
                 )
@@ -64,9 +70,9 @@ class PlayPauseCommand(Command):
                 )
         else:
             if self.player.state == State.Playing:
-                self.run_async(self.player.pause)
+                self.run_async(TaskKey.Player, self.player.pause)
             elif self.player.state == State.Paused:
-                self.run_async(self.player.play)
+                self.run_async(TaskKey.Player, self.player.play)
 
 
 class PlayUrlCommand(Command):
@@ -80,13 +86,14 @@ class PlayUrlCommand(Command):
                 tracks = self.module_manager.streamer.get(arg, user.is_admin)
                 if self.config.general.send_channel_messages:
                     self.run_async(
+                        TaskKey.Messaging,
                         self.ttclient.send_message,
                         self.translator.translate(
                             "{nickname} requested playing from a URL"
                         ).format(nickname=user.nickname),
                         type=2,
                     )
-                self.run_async(self.player.play, tracks)
+                self.run_async(TaskKey.Player, self.player.play, tracks)
             except errors.IncorrectProtocolError:
                 return self.translator.translate("Incorrect protocol")
             except errors.ServiceError:
@@ -237,12 +244,7 @@ class ModeCommand(Command):
         )
         if arg:
             try:
-                mode = Mode(arg.lower())
-                if mode == Mode.Random:
-                    self.player.shuffle(True)
-                if self.player.mode == Mode.Random and mode != Mode.Random:
-                    self.player.shuffle(False)
-                self.player.mode = Mode(mode)
+                self.player.set_mode(Mode(arg.lower()))
                 return self.translator.translate("Current mode: {mode}").format(
                     mode=self.mode_names[self.player.mode]
                 )
@@ -348,7 +350,8 @@ class SelectTrackCommand(Command):
                     return self.translator.translate("Incorrect number")
                 self.player.play_by_index(index)
                 return self.translator.translate("Playing {} {}").format(
-                    arg, self.player.track.name
+                    self._format_number(self.player.track_index + 1),
+                    self.player.track.name,
                 )
             except errors.IncorrectTrackIndexError:
                 return self.translator.translate("Out of list")
@@ -359,11 +362,18 @@ class SelectTrackCommand(Command):
         else:
             if self.player.state != State.Stopped:
                 return self.translator.translate("Playing {} {}").format(
-                    self.player.track_index + 1, self.player.track.name
+                    self._format_number(self.player.track_index + 1),
+                    self.player.track.name,
                 )
             else:
                 return self.translator.translate("Nothing is playing")
 
+    def _format_number(self, number: int) -> str:
+        track_count = self.player.track_count
+        if track_count is None:
+            return str(number)
+        return "{}/{}".format(number, track_count)
+
 
 class SpeedCommand(Command):
     @property
@@ -387,8 +397,11 @@ class SpeedCommand(Command):
 class FavoritesCommand(Command):
     @property
     def help(self) -> str:
-        return self.translator.translate(
-            "+/-NUMBER Manages favorite tracks. + adds the current track to favorites. - removes a track requested from favorites. If a number is specified after +/-, adds/removes a track with that number"
+        return "{}. {}".format(
+            self.translator.translate(
+                "+/-NUMBER Manages favorite tracks. + adds the current track to favorites. - removes a track requested from favorites. If a number is specified after +/-, adds/removes a track with that number"
+            ),
+            self.translator.translate("pNUMBER shows the page with the given number"),
         )
 
     def __call__(self, arg: str, user: User) -> Optional[str]:
@@ -396,7 +409,10 @@ class FavoritesCommand(Command):
             return self.translator.translate(
                 "This command is not available for guest users"
             )
-        if arg:
+        page = self.command_processor.parse_page(arg)
+        if page:
+            return self._list(user, page)
+        elif arg:
             if arg[0] == "+":
                 return self._add(user)
             elif arg[0] == "-":
@@ -404,15 +420,11 @@ class FavoritesCommand(Command):
             else:
                 return self._play(arg, user)
         else:
-            return self._list(user)
+            return self._list(user, 1)
 
     def _add(self, user: User) -> str:
         if self.player.state != State.Stopped:
-            if user.username in self.cache.favorites:
-                self.cache.favorites[user.username].append(self.player.track.get_raw())
-            else:
-                self.cache.favorites[user.username] = [self.player.track.get_raw()]
-            self.cache_manager.save()
+            self.cache_manager.add_favorite(user.username, self.player.track.get_raw())
             return self.translator.translate("Added")
         else:
             return self.translator.translate("Nothing is playing")
@@ -421,10 +433,12 @@ class FavoritesCommand(Command):
         if (self.player.state != State.Stopped and len(arg) == 1) or len(arg) > 1:
             try:
                 if len(arg) == 1:
-                    self.cache.favorites[user.username].remove(self.player.track)
+                    index = self.cache.favorites[user.username].index(
+                        self.player.track
+                    )
                 else:
-                    del self.cache.favorites[user.username][int(arg[1::]) - 1]
-                self.cache_manager.save()
+                    index = int(arg[1::]) - 1
+                self.cache_manager.delete_favorite(user.username, index)
                 return self.translator.translate("Deleted")
             except IndexError:
                 return self.translator.translate("Out of list")
@@ -435,20 +449,17 @@ class FavoritesCommand(Command):
         else:
             return self.translator.translate("Nothing is playing")
 
-    def _list(self, user: User) -> str:
-        track_names: List[str] = []
-        try:
-            for number, track in enumerate(self.cache.favorites[user.username]):
-                track_names.append(
-                    "{number}: {track_name}".format(
-                        number=number + 1,
-                        track_name=track.name if track.name else track.url,
-                    )
-                )
-        except KeyError:
-            pass
-        if len(track_names) > 0:
-            return "\n".join(track_names)
+    def _list(self, user: User, page: int) -> str:
+        favorites = self.cache.favorites.get(user.username)
+        if favorites:
+            return self.command_processor.format_page(
+                favorites,
+                page,
+                lambda number, track: "{number}: {track_name}".format(
+                    number=number,
+                    track_name=track.name if track.name else track.url,
+                ),
+            )
         else:
             return self.translator.translate("The list is empty")
 
@@ -485,12 +496,16 @@ class GetLinkCommand(Command):
 class RecentsCommand(Command):
     @property
     def help(self) -> str:
-        return self.translator.translate(
-            "NUMBER Plays a track with  the given number from a list of recent tracks. Without a number shows recent tracks"
+        return "{}. {}".format(
+            self.translator.translate(
+                "NUMBER Plays a track with  the given number from a list of recent tracks. Without a number shows recent tracks"
+            ),
+            self.translator.translate("pNUMBER shows the page with the given number"),
         )
 
     def __call__(self, arg: str, user: User) -> Optional[str]:
-        if arg:
+        page = self.command_processor.parse_page(arg)
+        if arg and not page:
             try:
                 self.player.play(
                     list(reversed(list(self.cache.recents))),
@@ -501,16 +516,15 @@ class RecentsCommand(Command):
             except IndexError:
                 return self.translator.translate("Out of list")
         else:
-            track_names: List[str] = []
-            for number, track in enumerate(reversed(self.cache.recents)):
-                if track.name:
-                    track_names.append(f"{number + 1}: {track.name}")
-                else:
-                    track_names.append(f"{number + 1}: {track.url}")
-            return (
-                "\n".join(track_names)
-                if track_names
-                else self.translator.translate("The list is empty")
+            recents = list(reversed(self.cache.recents))
+            if not recents:
+                return self.translator.translate("The list is empty")
+            return self.command_processor.format_page(
+                recents,
+                page or 1,
+                lambda number, track: "{}: {}".format(
+                    number, track.name if track.name else track.url
+                ),
             )
 
 
@@ -534,7 +548,9 @@ class DownloadCommand(Command):
             if track.url and (
                 track.type == TrackType.Default or track.type == TrackType.Local
             ):
-                self.module_manager.uploader(self.player.track, user)
+                self.run_async(
+                    TaskKey.Download, self.module_manager.uploader, track, user
+                )
                 return self.translator.translate("Downloading...")
             else:
                 return self.translator.translate("Live streams cannot be downloaded")
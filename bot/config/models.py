@@ -7,9 +7,13 @@ class GeneralModel(BaseModel):
     language: str = "en"
     send_channel_messages: bool = True
     cache_file_name: str = "TTMediaBotCache.dat"
+    cache_save_interval: float = 5
     blocked_commands: List[str] = []
     delete_uploaded_files_after: int = 300
     time_format: str = r"%H:%M"
+    command_workers: int = 4
+    max_user_command_queue_size: int = 3
+    page_size: int = 20
 
 
 class SoundDevicesModel(BaseModel):
@@ -23,6 +27,8 @@ class PlayerModel(BaseModel):
     volume_fading: bool = True
     volume_fading_interval: float = 0.025
     seek_step: int = 5
+    prefetch_tracks: int = 2
+    gapless: bool = False
     player_options: Dict[str, Any] = {}
 
 
@@ -52,6 +58,11 @@ class TeamTalkModel(BaseModel):
     license_key: str = ""
     reconnection_attempts: int = -1
     reconnection_timeout: int = 10
+    status_update_window: float = 0.5
+    max_status_updates_per_second: int = 1
+    messages_per_second: float = 4
+    message_burst: int = 8
+    max_queued_messages: int = 100
     users: TeamTalkUserModel = TeamTalkUserModel()
     event_handling: EventHandlingModel = EventHandlingModel()
 
@@ -63,6 +74,9 @@ class VkModel(BaseModel):
 
 class YtModel(BaseModel):
     enabled: bool = True
+    info_cache_file_name: str = "TTMediaBotYtCache.dat"
+    info_cache_size: int = 1000
+    info_cache_ttl: float = 3600
 
 
 class YamModel(BaseModel):
@@ -75,6 +89,10 @@ class ServicesModel(BaseModel):
     vk: VkModel = VkModel()
     yam: YamModel = YamModel()
     yt: YtModel = YtModel()
+    stream_cache_size: int = 200
+    stream_cache_ttl: float = 1800
+    search_cache_size: int = 100
+    search_cache_ttl: float = 600
 
 
 class LoggerModel(BaseModel):
@@ -1,11 +1,10 @@
 from __future__ import annotations
 import logging
+from queue import Queue
 from threading import Thread
-import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from bot.player import State
-from bot import app_vars
+from bot.player.enums import PlayerEvent, State, TrackType
 
 if TYPE_CHECKING:
     from bot import Bot
@@ -18,61 +17,51 @@ class TTPlayerConnector(Thread):
         self.player = bot.player
         self.ttclient = bot.ttclient
         self.translator = bot.translator
+        self._events: Queue[Optional[PlayerEvent]] = Queue()
+        self._state = State.Stopped
+        self._status_text = ""
+        self.player.subscribe(self._events.put)
 
     def run(self):
-        last_player_state = State.Stopped
-        last_track_meta = {"name": None, "url": None}
-        self._close = False
-        while not self._close:
+        while True:
+            event = self._events.get()
+            if event is None:
+                break
             try:
-                if self.player.state != last_player_state:
-                    last_player_state = self.player.state
-                    if self.player.state == State.Playing:
-                        self.ttclient.enable_voice_transmission()
-                        last_track_meta = self.player.track.get_meta()
-                        if self.player.track.name:
-                            self.ttclient.change_status_text(
-                                self.translator.translate(
-                                    "Playing: {track_name}"
-                                ).format(track_name=self.player.track.name)
-                            )
-                        else:
-                            self.ttclient.change_status_text(
-                                self.translator.translate(
-                                    "Playing: {stream_url}"
-                                ).format(stream_url=self.player.track.url)
-                            )
-                    elif self.player.state == State.Stopped:
-                        self.ttclient.disable_voice_transmission()
-                        self.ttclient.change_status_text("")
-                    elif self.player.state == State.Paused:
-                        self.ttclient.disable_voice_transmission()
-                        if self.player.track.name:
-                            self.ttclient.change_status_text(
-                                self.translator.translate(
-                                    "Paused: {track_name}"
-                                ).format(track_name=self.player.track.name)
-                            )
-                        else:
-                            self.ttclient.change_status_text(
-                                self.translator.translate(
-                                    "Paused: {stream_url}"
-                                ).format(stream_url=self.player.track.url)
-                            )
-                if (
-                    self.player.track.get_meta() != last_track_meta
-                    and last_player_state != State.Stopped
-                ):
-                    last_track_meta = self.player.track.get_meta()
-                    self.ttclient.change_status_text(
-                        "{state}: {name}".format(
-                            state=self.ttclient.status.split(":")[0],
-                            name=self.player.track.name,
-                        )
-                    )
+                self.update()
             except Exception:
                 logging.error("", exc_info=True)
-            time.sleep(app_vars.loop_timeout)
+
+    def update(self) -> None:
+        state = self.player.state
+        if state != self._state:
+            self._state = state
+            if state == State.Playing:
+                self.ttclient.enable_voice_transmission()
+            else:
+                self.ttclient.disable_voice_transmission()
+        status_text = self._get_status_text(state)
+        if status_text != self._status_text:
+            self._status_text = status_text
+            self.ttclient.change_status_text(status_text)
+
+    def _get_status_text(self, state: State) -> str:
+        if state == State.Stopped:
+            return ""
+        track = self.player.track
+        if state == State.Playing:
+            name_template = self.translator.translate("Playing: {track_name}")
+            url_template = self.translator.translate("Playing: {stream_url}")
+        else:
+            name_template = self.translator.translate("Paused: {track_name}")
+            url_template = self.translator.translate("Paused: {stream_url}")
+        if track.has_name:
+            return name_template.format(track_name=track.name)
+        # Reading the URL of an unresolved track would resolve it
+        elif track.type != TrackType.Dynamic:
+            return url_template.format(stream_url=track.url)
+        else:
+            return self._status_text
 
     def close(self):
-        self._close = True
+        self._events.put(None)
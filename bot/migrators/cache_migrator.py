@@ -12,7 +12,21 @@ def to_v1(cache_data: cache_data_type) -> cache_data_type:
     return update_version(cache_data, 1)
 
 
-migrate_functs = {1: to_v1}
+def to_v2(cache_data: cache_data_type) -> cache_data_type:
+    # Pickled tracks may have been played and resolved, get_raw() undoes that
+    if "recents" in cache_data:
+        cache_data["recents"] = [
+            i.get_raw().get_record() for i in cache_data["recents"]
+        ]
+    if "favorites" in cache_data:
+        cache_data["favorites"] = {
+            username: [i.get_raw().get_record() for i in tracks]
+            for username, tracks in cache_data["favorites"].items()
+        }
+    return update_version(cache_data, 2)
+
+
+migrate_functs = {1: to_v1, 2: to_v2}
 
 
 def migrate(
@@ -26,17 +40,16 @@ def migrate(
         or cache_data["cache_version"] > cache_manager.version
     ):
         sys.exit("Error: invalid cache_version value")
-    elif cache_data["cache_version"] == cache_manager.version:
+    if cache_data["cache_version"] == cache_manager.version:
         return cache_data
-    else:
-        for ver in migrate_functs:
-            if ver > cache_data["cache_version"]:
-                cache_data = migrate_functs[ver](cache_data)
-        cache_manager._dump(cache_data)
+    for ver in migrate_functs:
+        if ver > cache_data["cache_version"]:
+            cache_data = migrate_functs[ver](cache_data)
     return cache_data
 
 
 def update_version(cache_data: cache_data_type, version: int) -> cache_data_type:
     _cache_data = {"cache_version": version}
     _cache_data.update(cache_data)
+    _cache_data["cache_version"] = version
     return _cache_data
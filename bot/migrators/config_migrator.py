@@ -1,6 +1,11 @@
+from __future__ import annotations
+
 import sys
+from typing import TYPE_CHECKING
+
 
-from bot.config import ConfigManager, config_data_type
+if TYPE_CHECKING:
+    from bot.config import ConfigManager, config_data_type
 
 
 def to_v1(config_data: config_data_type) -> config_data_type:
@@ -3,13 +3,13 @@ import threading
 import time
 import os
 import tempfile
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 from queue import Empty
 
 
 from bot.player.track import Track
 from bot.player.enums import TrackType
-from bot.TeamTalk.structs import ErrorType, User
+from bot.TeamTalk.structs import ErrorType, File, User
 from bot import app_vars
 
 if TYPE_CHECKING:
@@ -23,18 +23,10 @@ class Uploader:
         self.translator = bot.translator
 
     def __call__(self, track: Track, user: User) -> None:
-        thread = threading.Thread(
-            target=self.run,
-            daemon=True,
-            args=(
-                track,
-                user,
-            ),
-        )
-        thread.start()
+        self.run(track, user)
 
     def run(self, track: Track, user: User) -> None:
-        error_exit = False
+        file: Optional[File] = None
         if track.type == TrackType.Default:
             temp_dir = tempfile.TemporaryDirectory()
             file_path = track.download(temp_dir.name)
@@ -44,11 +36,12 @@ class Uploader:
         file_name = os.path.basename(file_path)
         while True:
             try:
-                file = self.ttclient.uploaded_files_queue.get_nowait()
-                if file.name == file_name:
+                uploaded_file = self.ttclient.uploaded_files_queue.get_nowait()
+                if uploaded_file.name == file_name:
+                    file = uploaded_file
                     break
                 else:
-                    self.ttclient.uploaded_files_queue.put(file)
+                    self.ttclient.uploaded_files_queue.put(uploaded_file)
             except Empty:
                 pass
             try:
@@ -63,7 +56,7 @@ class Uploader:
                         ),
                         user,
                     )
-                    error_exit = True
+                    break
                 else:
                     self.ttclient.errors_queue.put(error)
             except Empty:
@@ -72,11 +65,14 @@ class Uploader:
         time.sleep(app_vars.loop_timeout)
         if track.type == TrackType.Default:
             temp_dir.cleanup()
-        if error_exit:
+        if not file:
             return
         if self.config.general.delete_uploaded_files_after > 0:
             timeout = self.config.general.delete_uploaded_files_after
         else:
             return
-        time.sleep(timeout)
-        self.ttclient.delete_file(file.channel.id, file.id)
+        timer = threading.Timer(
+            timeout, self.ttclient.delete_file, args=(file.channel.id, file.id)
+        )
+        timer.daemon = True
+        timer.start()
@@ -15,6 +15,11 @@ class Mode(Enum):
     Random = "rnd"
 
 
+class PlayerEvent(Enum):
+    StateChanged = "state_changed"
+    MetadataChanged = "metadata_changed"
+
+
 class TrackType(Enum):
     Default = 0
     Live = 1
@@ -0,0 +1,541 @@
+from __future__ import annotations
+from functools import partial
+import html
+import logging
+from queue import Empty, Queue
+from threading import Lock, Thread
+import time
+from typing import Any, Dict, Callable, List, Optional, TYPE_CHECKING
+import random
+import sys
+
+import mpv
+
+from bot import errors
+from bot.player.enums import Mode, PlayerEvent, State, TrackType
+from bot.player.track import Track
+from bot.player.track_list import LazyTrackList
+from bot.sound_devices import SoundDevice, SoundDeviceType
+
+
+if TYPE_CHECKING:
+    from bot import Bot
+
+
+class Player:
+    def __init__(self, bot: Bot):
+        self.config = bot.config.player
+        self.cache = bot.cache
+        self.cache_manager = bot.cache_manager
+        self.service_manager = bot.service_manager
+        mpv_options = {
+            "demuxer_lavf_o": "http_persistent=false",
+            "demuxer_max_back_bytes": 1048576,
+            "demuxer_max_bytes": 2097152,
+            "video": False,
+            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36",
+            "ytdl": False,
+        }
+        if self.config.gapless:
+            mpv_options["prefetch_playlist"] = True
+        mpv_options.update(self.config.player_options)
+        try:
+            self._player = mpv.MPV(**mpv_options, log_handler=self.log_handler)
+        except AttributeError:
+            del mpv_options["demuxer_max_back_bytes"]
+            self._player = mpv.MPV(**mpv_options, log_handler=self.log_handler)
+        self._log_level = 5
+        self.track_list: List[Track] = []
+        self.track: Track = Track()
+        self.track_index: int = -1
+        self._state = State.Stopped
+        self._subscribers: List[Callable[[PlayerEvent], None]] = []
+        self.mode = Mode.TrackList
+        self.volume = self.config.default_volume
+        self.last_gap_time = 0.0
+        self.gap_time = 0.0
+        self.gaps = 0
+        self._track_ended_at: Optional[float] = None
+        self._prefetch_queue: Queue[Optional[Callable[[], None]]] = Queue()
+        self._prefetcher = Thread(target=self._run_prefetcher, daemon=True)
+        self._prefetcher.name = "PlayerPrefetcher"
+        # Track indexes queued in mpv's playlist after the current entry
+        self._playlist_lock = Lock()
+        self._playlist_indexes: List[int] = []
+        # Tracks of track_list whose names have already been requested
+        self._named_tracks = 0
+
+    @property
+    def state(self) -> State:
+        return self._state
+
+    @state.setter
+    def state(self, state: State) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        self._publish(PlayerEvent.StateChanged)
+
+    def subscribe(self, callback: Callable[[PlayerEvent], None]) -> None:
+        self._subscribers.append(callback)
+
+    def _publish(self, event: PlayerEvent) -> None:
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception:
+                logging.error("", exc_info=True)
+
+    def initialize(self) -> None:
+        logging.debug("Initializing player")
+        logging.debug("Player initialized")
+
+    def run(self) -> None:
+        logging.debug("Registering player callbacks")
+        self.register_event_callback("end-file", self.on_end_file)
+        self.register_event_callback("playback-restart", self.on_playback_restart)
+        self._prefetcher.start()
+        self._player.observe_property("metadata", self.on_metadata_update)
+        self._player.observe_property("media-title", self.on_metadata_update)
+        if self.config.gapless:
+            self._player.observe_property("playlist-pos", self.on_playlist_pos_update)
+        logging.debug("Player callbacks registered")
+
+    def close(self) -> None:
+        logging.debug("Closing player")
+        if self.state != State.Stopped:
+            self.stop()
+        self._prefetch_queue.put(None)
+        self._player.terminate()
+        logging.debug("Player closed")
+
+    def play(
+        self,
+        tracks: Optional[List[Track]] = None,
+        start_track_index: Optional[int] = None,
+    ) -> None:
+        if tracks != None:
+            self._close_track_list()
+            self.track_list = tracks
+            self._named_tracks = 0
+            if not start_track_index and self.mode == Mode.Random:
+                self.shuffle(True)
+                self.track_index = self._index_list[0]
+                self.track = self.track_list[self.track_index]
+            else:
+                self.track_index = start_track_index if start_track_index else 0
+                self.track = tracks[self.track_index]
+            self._play(self.track.url)
+        else:
+            self._player.pause = False
+        self._player.volume = self.volume
+        self.state = State.Playing
+
+    def pause(self) -> None:
+        self.state = State.Paused
+        self._player.pause = True
+
+    def stop(self) -> None:
+        self.state = State.Stopped
+        with self._playlist_lock:
+            self._playlist_indexes = []
+            self._player.stop()
+        self._close_track_list()
+        self.track_list = []
+        self._named_tracks = 0
+        self.track = Track()
+        self.track_index = -1
+        self._publish(PlayerEvent.MetadataChanged)
+
+    @property
+    def track_count(self) -> Optional[int]:
+        if isinstance(self.track_list, LazyTrackList):
+            return self.track_list.total
+        return len(self.track_list)
+
+    def _close_track_list(self) -> None:
+        if isinstance(self.track_list, LazyTrackList):
+            self.track_list.close()
+
+    def _load_track(self, index: int) -> bool:
+        if isinstance(self.track_list, LazyTrackList):
+            return self.track_list.load(index if index >= 0 else sys.maxsize)
+        return index < len(self.track_list)
+
+    def _extend_index_list(self) -> None:
+        # Tracks loaded after shuffling are shuffled in after the known ones
+        if len(self._index_list) < len(self.track_list):
+            indexes = list(range(len(self._index_list), len(self.track_list)))
+            random.shuffle(indexes)
+            self._index_list += indexes
+
+    def _play(self, arg: str, save_to_recents: bool = True) -> None:
+        if save_to_recents:
+            self._save_to_recents()
+        self._player.pause = False
+        with self._playlist_lock:
+            # Replacing the file drops everything queued after it as well
+            self._playlist_indexes = []
+            self._player.play(arg)
+        self._publish(PlayerEvent.MetadataChanged)
+        self.prefetch()
+        self.fill_playlist()
+
+    def _save_to_recents(self) -> None:
+        try:
+            if self.cache.recents[-1] != self.track_list[self.track_index]:
+                self.cache_manager.add_recent(
+                    self.track_list[self.track_index].get_raw()
+                )
+        except:
+            self.cache_manager.add_recent(self.track_list[self.track_index].get_raw())
+
+    def next(self) -> None:
+        track_index = self.track_index
+        if len(self.track_list) > 0:
+            if self.mode == Mode.Random:
+                position = self._index_list.index(self.track_index) + 1
+                if position >= len(self._index_list):
+                    self._load_track(len(self.track_list))
+                    self._extend_index_list()
+                try:
+                    track_index = self._index_list[position]
+                except IndexError:
+                    track_index = 0
+            else:
+                track_index += 1
+        else:
+            track_index = 0
+        try:
+            self.play_by_index(track_index)
+        except errors.IncorrectTrackIndexError:
+            if self.mode == Mode.RepeatTrackList:
+                self.play_by_index(0)
+            else:
+                raise errors.NoNextTrackError()
+
+    def previous(self) -> None:
+        track_index = self.track_index
+        if len(self.track_list) > 0:
+            if self.mode == Mode.Random:
+                try:
+                    track_index = self._index_list[
+                        self._index_list.index(self.track_index) - 1
+                    ]
+                except IndexError:
+                    track_index = len(self.track_list) - 1
+            else:
+                if track_index == 0 and self.mode != Mode.RepeatTrackList:
+                    raise errors.NoPreviousTrackError
+                else:
+                    track_index -= 1
+        else:
+            track_index = 0
+        try:
+            self.play_by_index(track_index)
+        except errors.IncorrectTrackIndexError:
+            if self.mode == Mode.RepeatTrackList:
+                self.play_by_index(len(self.track_list) - 1)
+            else:
+                raise errors.NoPreviousTrackError
+
+    def get_next_indexes(self, count: int) -> List[int]:
+        indexes: List[int] = []
+        if self.mode in (Mode.SingleTrack, Mode.RepeatTrack) or not self.track_list:
+            return indexes
+        track_index = self.track_index
+        for _ in range(count):
+            if self.mode == Mode.Random:
+                try:
+                    position = self._index_list.index(track_index) + 1
+                    if position >= len(self._index_list):
+                        self._extend_index_list()
+                    track_index = self._index_list[position]
+                except IndexError:
+                    track_index = 0
+                except (AttributeError, ValueError):
+                    break
+            else:
+                track_index += 1
+            if track_index >= len(self.track_list):
+                if (
+                    isinstance(self.track_list, LazyTrackList)
+                    and not self.track_list.complete
+                ):
+                    break
+                if self.mode == Mode.RepeatTrackList:
+                    track_index = 0
+                else:
+                    break
+            if track_index == self.track_index:
+                break
+            indexes.append(track_index)
+        return indexes
+
+    def prefetch(self) -> None:
+        # Only the tracks following the current one are worth resolving
+        while True:
+            try:
+                self._prefetch_queue.get_nowait()
+            except Empty:
+                break
+        tracks = [
+            self.track_list[i]
+            for i in self.get_next_indexes(self.config.prefetch_tracks)
+            if self.track_list[i].type == TrackType.Dynamic
+        ]
+        if tracks:
+            self._prefetch_queue.put(partial(self._prefetch_tracks, tracks))
+        # Names let track listings show unresolved tracks without resolving
+        # them, they are requested once for each newly loaded range
+        tracks = self.track_list[self._named_tracks :]
+        self._named_tracks += len(tracks)
+        unnamed_tracks = [
+            i for i in tracks if i.type == TrackType.Dynamic and not i.has_name
+        ]
+        if unnamed_tracks:
+            self._prefetch_queue.put(partial(self._load_names, unnamed_tracks))
+        if isinstance(self.track_list, LazyTrackList):
+            self.track_list.load_in_background(
+                self.track_index + self.config.prefetch_tracks + 1
+            )
+
+    def _run_prefetcher(self) -> None:
+        while True:
+            job = self._prefetch_queue.get()
+            if job is None:
+                break
+            job()
+
+    def _group_by_service(self, tracks: List[Track]) -> Dict[str, List[Track]]:
+        groups: Dict[str, List[Track]] = {}
+        for track in tracks:
+            groups.setdefault(track.service, []).append(track)
+        return groups
+
+    def _prefetch_tracks(self, tracks: List[Track]) -> None:
+        for service_name, service_tracks in self._group_by_service(tracks).items():
+            try:
+                self.service_manager.get_service_by_name(service_name).prefetch(
+                    service_tracks
+                )
+            except Exception:
+                logging.debug("Cannot prefetch tracks", exc_info=True)
+        for track in tracks:
+            try:
+                track.url
+            except Exception:
+                logging.debug("Cannot prefetch track", exc_info=True)
+                continue
+            self.fill_playlist()
+
+    def _load_names(self, tracks: List[Track]) -> None:
+        for service_name, service_tracks in self._group_by_service(tracks).items():
+            try:
+                service = self.service_manager.get_service_by_name(service_name)
+                if service.loads_names:
+                    service.load_names(service_tracks)
+            except Exception:
+                logging.debug("Cannot load track names", exc_info=True)
+
+    def fill_playlist(self) -> None:
+        if not self.config.gapless:
+            return
+        with self._playlist_lock:
+            # mpv has already moved on, the playlist-pos callback refills it
+            if self._player.playlist_pos not in (0, None):
+                return
+            if self.track.type == TrackType.Direct:
+                indexes: List[int] = []
+            else:
+                indexes = self.get_next_indexes(self.config.prefetch_tracks)
+            kept = 0
+            while (
+                kept < len(self._playlist_indexes)
+                and kept < len(indexes)
+                and self._playlist_indexes[kept] == indexes[kept]
+            ):
+                kept += 1
+            while len(self._playlist_indexes) > kept:
+                self._player.playlist_remove(len(self._playlist_indexes))
+                self._playlist_indexes.pop()
+            # Unresolved tracks would block mpv, the prefetcher appends them later
+            for index in indexes[kept:]:
+                track = self.track_list[index]
+                if track.type == TrackType.Dynamic:
+                    break
+                self._player.playlist_append(track.url)
+                self._playlist_indexes.append(index)
+
+    def play_by_index(self, index: int) -> None:
+        self._load_track(index)
+        if index < len(self.track_list) and index >= (0 - len(self.track_list)):
+            self.track = self.track_list[index]
+            self.track_index = self.track_list.index(self.track)
+            self._play(self.track.url)
+            self.state = State.Playing
+        else:
+            raise errors.IncorrectTrackIndexError()
+
+    def set_volume(self, volume: int) -> None:
+        volume = volume if volume <= self.config.max_volume else self.config.max_volume
+        self.volume = volume
+        if self.config.volume_fading:
+            n = 1 if self._player.volume < volume else -1
+            for i in range(int(self._player.volume), volume, n):
+                self._player.volume = i
+                time.sleep(self.config.volume_fading_interval)
+        else:
+            self._player.volume = volume
+
+    def get_speed(self) -> float:
+        return self._player.speed
+
+    def set_speed(self, arg: float) -> None:
+        if arg < 0.25 or arg > 4:
+            raise ValueError()
+        self._player.speed = arg
+
+    def seek_back(self, step: Optional[float] = None) -> None:
+        step = step if step else self.config.seek_step
+        if step <= 0:
+            raise ValueError()
+        try:
+            self._player.seek(-step, reference="relative")
+        except SystemError:
+            self.stop()
+
+    def seek_forward(self, step: Optional[float] = None) -> None:
+        step = step if step else self.config.seek_step
+        if step <= 0:
+            raise ValueError()
+        try:
+            self._player.seek(step, reference="relative")
+        except SystemError:
+            self.stop()
+
+    def get_duration(self) -> float:
+        return self._player.duration
+
+    """def get_position(self) -> float:
+        return self._player.time_pos
+
+    def set_position(self, arg: float) -> None:
+        if arg < 0:
+            raise errors.IncorrectPositionError()
+        self._player.seek(arg, reference="absolute")"""
+
+    def get_output_devices(self) -> List[SoundDevice]:
+        devices: List[SoundDevice] = []
+        for device in self._player.audio_device_list:
+            devices.append(
+                SoundDevice(
+                    device["description"], device["name"], SoundDeviceType.Output
+                )
+            )
+        return devices
+
+    def set_output_device(self, id: str) -> None:
+        self._player.audio_device = id
+
+    def set_mode(self, mode: Mode) -> None:
+        if mode == Mode.Random:
+            self.shuffle(True)
+        if self.mode == Mode.Random and mode != Mode.Random:
+            self.shuffle(False)
+        self.mode = mode
+        self.prefetch()
+        self.fill_playlist()
+
+    def shuffle(self, enable: bool) -> None:
+        if enable:
+            self._index_list = [i for i in range(0, len(self.track_list))]
+            random.shuffle(self._index_list)
+        else:
+            del self._index_list
+
+    def register_event_callback(
+        self, callback_name: str, callback_func: Callable[[Dict[str, Any]], None]
+    ) -> None:
+        self._player.event_callback(callback_name)(callback_func)
+
+    def log_handler(self, level: str, component: str, message: str) -> None:
+        logging.log(self._log_level, "{}: {}: {}".format(level, component, message))
+
+    def _parse_metadata(self, metadata: Dict[str, Any]) -> str:
+        stream_names = ["icy-name"]
+        stream_name = None
+        title = None
+        artist = None
+        for i in metadata:
+            if i in stream_names:
+                stream_name = html.unescape(metadata[i])
+            if "title" in i:
+                title = html.unescape(metadata[i])
+            if "artist" in i:
+                artist = html.unescape(metadata[i])
+        chunks: List[str] = []
+        chunks.append(artist) if artist else ...
+        chunks.append(title) if title else ...
+        chunks.append(stream_name) if stream_name else ...
+        return " - ".join(chunks)
+
+    def on_end_file(self, event: Dict[str, Any]) -> None:
+        if (
+            self.state == State.Playing
+            and self._playlist_indexes
+            and event["event"]["reason"] == mpv.MpvEventEndFile.EOF
+        ):
+            # mpv continues with the next queued entry on its own
+            self._track_ended_at = time.monotonic()
+        elif self.state == State.Playing and self._player.idle_active:
+            if self.mode == Mode.SingleTrack or self.track.type == TrackType.Direct:
+                self.stop()
+                return
+            self._track_ended_at = time.monotonic()
+            if self.mode == Mode.RepeatTrack:
+                self.play_by_index(self.track_index)
+            else:
+                try:
+                    self.next()
+                except errors.NoNextTrackError:
+                    self._track_ended_at = None
+                    self.stop()
+
+    def on_playlist_pos_update(self, name: str, value: Optional[int]) -> None:
+        if not value or value < 1:
+            return
+        with self._playlist_lock:
+            if len(self._playlist_indexes) < value:
+                return
+            for _ in range(value):
+                self.track_index = self._playlist_indexes.pop(0)
+                self._player.playlist_remove(0)
+            self.track = self.track_list[self.track_index]
+        self._publish(PlayerEvent.MetadataChanged)
+        self._save_to_recents()
+        self.prefetch()
+        self.fill_playlist()
+
+    def on_playback_restart(self, event: Dict[str, Any]) -> None:
+        if self._track_ended_at is None:
+            return
+        self.last_gap_time = time.monotonic() - self._track_ended_at
+        self._track_ended_at = None
+        self.gap_time += self.last_gap_time
+        self.gaps += 1
+
+    def on_metadata_update(self, name: str, value: Any) -> None:
+        if self.state == State.Playing and (
+            self.track.type == TrackType.Direct or self.track.type == TrackType.Local
+        ):
+            metadata = self._player.metadata
+            try:
+                new_name = self._parse_metadata(metadata)
+                if not new_name:
+                    new_name = html.unescape(self._player.media_title)
+            except TypeError:
+                new_name = html.unescape(self._player.media_title)
+            if self.track.name != new_name and new_name:
+                self.track.name = new_name
+                self._publish(PlayerEvent.MetadataChanged)
@@ -5,7 +5,7 @@ from threading import Lock
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from bot.player.enums import TrackType
-from bot import utils
+from bot import errors, utils
 
 if TYPE_CHECKING:
     from bot.services import Service
@@ -46,7 +46,7 @@ class Track:
             return
         self._original_track = copy.deepcopy(self)
         service: Service = get_service_by_name(self.service)
-        track = service.get(self._url, extra_info=self.extra_info, process=True)[0]
+        track = service.resolve(self._url, extra_info=self.extra_info)
         self.url = track.url
         self.name = track.name
         self._original_track.name = track.name
@@ -76,12 +76,47 @@ class Track:
     def name(self, value: str) -> None:
         self._name = value
 
+    @property
+    def has_name(self) -> bool:
+        return bool(self._name)
+
     def get_meta(self) -> Dict[str, Any]:
         try:
             return {"name": self.name, "url": self.url}
         except:
             return {"name": None, "url": ""}
 
+    def get_record(self) -> Dict[str, Any]:
+        # A played track is resolved in place, the record keeps what it was
+        # created from rather than a stream URL that expires
+        track = self.get_raw()
+        extra_info = track.extra_info
+        if extra_info and track.service:
+            try:
+                service: Service = get_service_by_name(track.service)
+                extra_info = service.compact_extra_info(extra_info)
+            except (errors.ServiceNotFoundError, errors.ServiceIsDisabledError):
+                pass
+        return {
+            "service": track.service,
+            "url": track._url,
+            "name": track._name,
+            "format": track.format,
+            "type": track.type.value,
+            "extra_info": extra_info,
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> Track:
+        return cls(
+            service=record["service"],
+            url=record["url"],
+            name=record["name"],
+            format=record["format"],
+            extra_info=record["extra_info"],
+            type=TrackType(record["type"]),
+        )
+
     def get_raw(self) -> Track:
         if hasattr(self, "_original_track"):
             return self._original_track
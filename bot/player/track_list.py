@@ -0,0 +1,109 @@
+from __future__ import annotations
+import copy
+import logging
+import sys
+from threading import RLock, Thread
+from typing import Iterable, Iterator, List, Optional
+
+from bot.player.track import Track
+
+
+class LazyTrackList(List[Track]):
+    """A list of tracks that is filled from an iterable as tracks are needed.
+
+    Indexes that have not been loaded yet behave as if they were out of the
+    list, so callers load them first with load(). The number of tracks the
+    source reports in advance, if any, is available as total.
+    """
+
+    def __init__(self, tracks: Iterable[Track], total: Optional[int] = None) -> None:
+        super().__init__()
+        self._total = total
+        self.complete = False
+        self._exhausted = False
+        self._tracks = iter(tracks)
+        self._lock = RLock()
+        self._loader: Optional[Thread] = None
+        self._target = -1
+        self.load(0)
+
+    @property
+    def total(self) -> Optional[int]:
+        """Returns the number of tracks, None while it is not known yet.
+
+        Until the list is complete this is what the source reported, which
+        may count entries that turn out not to be playable.
+        """
+        if self.complete:
+            return len(self)
+        if self._total is None:
+            return None
+        return max(self._total, len(self))
+
+    @property
+    def failed(self) -> bool:
+        """Returns whether loading stopped before the source ran out of tracks"""
+        return self.complete and not self._exhausted
+
+    def load(self, index: int) -> bool:
+        # Iterators cannot be advanced from two threads at once, but the
+        # lock is taken per track so that readers never wait for a whole page
+        while True:
+            with self._lock:
+                if len(self) > index or self.complete:
+                    return len(self) > index
+                try:
+                    self.append(next(self._tracks))
+                except StopIteration:
+                    self._exhausted = True
+                    self._finish()
+                except Exception:
+                    logging.error("Cannot load tracks", exc_info=True)
+                    self._finish()
+
+    def copy_lazily(self) -> LazyTrackList:
+        """Returns a list of copies of these tracks, loaded from this one as needed.
+
+        Tracks are resolved in place when played, so lists that are handed out
+        more than once are handed out as copies. Tracks are loaded into this
+        list once, however many copies read them.
+        """
+        return LazyTrackList(self._iterate_copies(), self.total)
+
+    def _iterate_copies(self) -> Iterator[Track]:
+        index = 0
+        while self.load(index):
+            yield copy.deepcopy(self[index])
+            index += 1
+
+    def load_all(self) -> None:
+        self.load(sys.maxsize)
+
+    def load_in_background(self, index: int = sys.maxsize) -> None:
+        with self._lock:
+            self._target = max(self._target, index)
+            if self.complete or len(self) > self._target or self._loader:
+                return
+            self._loader = Thread(target=self._run_loader, daemon=True)
+            self._loader.name = "TrackListLoader"
+            self._loader.start()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self.complete:
+                self._finish()
+
+    def _finish(self) -> None:
+        self.complete = True
+        close = getattr(self._tracks, "close", None)
+        if close:
+            close()
+
+    def _run_loader(self) -> None:
+        while True:
+            with self._lock:
+                if self.complete or len(self) > self._target:
+                    self._loader = None
+                    return
+                index = len(self)
+            self.load(index)
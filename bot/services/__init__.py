@@ -1,15 +1,19 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import copy
 import logging
+import unicodedata
 from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 import downloader
 
 from bot import app_vars, errors
+from bot.player.track_list import LazyTrackList
 
 if TYPE_CHECKING:
     from bot import Bot
     from bot.player.track import Track
+    from bot.services.ttl_cache import TtlCache
 
 
 class Service(ABC):
@@ -20,10 +24,71 @@ class Service(ABC):
     error_message: str
     warning_message: str
     help: str
+    stream_cache: TtlCache[Track]
+    search_cache: TtlCache[List[Track]]
 
     def download(self, track: Track, file_path: str) -> None:
         downloader.download_file(track.url, file_path)
 
+    def close(self) -> None:
+        pass
+
+    @property
+    def loads_names(self) -> bool:
+        return type(self).load_names is not Service.load_names
+
+    def load_names(self, tracks: List[Track]) -> None:
+        """Fills in names of unresolved tracks where a service can do it cheaply"""
+        pass
+
+    def prefetch(self, tracks: List[Track]) -> None:
+        """Prepares tracks that are about to be resolved one by one"""
+        pass
+
+    def compact_extra_info(
+        self, extra_info: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        return extra_info
+
+    def get_stream_id(
+        self, url: str, extra_info: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        return None
+
+    def get_stream_expiry(self, track: Track) -> Optional[float]:
+        return None
+
+    def resolve(self, url: str, extra_info: Optional[Dict[str, Any]] = None) -> Track:
+        id = self.get_stream_id(url, extra_info)
+        if id:
+            track = self.stream_cache.get((self.name, id))
+            if track:
+                return track
+        track = self.get(url, extra_info=extra_info, process=True)[0]
+        if id:
+            self.stream_cache.put((self.name, id), track, self.get_stream_expiry(track))
+        return track
+
+    def search_cached(self, query: str) -> List[Track]:
+        # Queries differing only in case or spacing share one entry
+        normalized_query = unicodedata.normalize("NFKC", query).casefold()
+        key = (self.name, " ".join(normalized_query.split()))
+        tracks = self.search_cache.get(key)
+        # Played tracks are resolved in place, so every caller gets copies
+        if isinstance(tracks, LazyTrackList):
+            if not tracks.failed:
+                return tracks.copy_lazily()
+        elif tracks is not None:
+            return copy.deepcopy(tracks)
+        tracks = self.search(query)
+        if isinstance(tracks, LazyTrackList):
+            # Results are cached from the first page on, later pages are
+            # loaded into the cached list when any caller gets near them
+            self.search_cache.put(key, tracks)
+            return tracks.copy_lazily()
+        self.search_cache.put(key, copy.deepcopy([i.get_raw() for i in tracks]))
+        return tracks
+
     @abstractmethod
     def get(
         self,
@@ -42,6 +107,7 @@ class Service(ABC):
         ...
 
 
+from bot.services.ttl_cache import TtlCache
 from bot.services.vk import VkService
 from bot.services.yam import YamService
 from bot.services.yt import YtService
@@ -55,6 +121,15 @@ class ServiceManager:
             "yam": YamService(bot, self.config.yam),
             "yt": YtService(bot, self.config.yt),
         }
+        self.stream_cache: TtlCache[Track] = TtlCache(
+            self.config.stream_cache_size, self.config.stream_cache_ttl
+        )
+        self.search_cache: TtlCache[List[Track]] = TtlCache(
+            self.config.search_cache_size, self.config.search_cache_ttl
+        )
+        for service in self.services.values():
+            service.stream_cache = self.stream_cache
+            service.search_cache = self.search_cache
         self.service: Service = self.services[self.config.default_service]
         self.fallback_service = app_vars.fallback_service
         import builtins
@@ -75,6 +150,13 @@ class ServiceManager:
                     self.service = self.services[self.fallback_service]
         logging.debug("Services initialized")
 
+    def close(self) -> None:
+        logging.debug("Closing services")
+        for service in self.services.values():
+            if service.is_enabled:
+                service.close()
+        logging.debug("Services closed")
+
     def get_service_by_name(self, name: str) -> Service:
         try:
             service = self.services[name]
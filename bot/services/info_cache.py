@@ -0,0 +1,105 @@
+from __future__ import annotations
+from collections import OrderedDict
+import copy
+import logging
+import os
+import pickle
+from threading import Lock
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class InfoCache:
+    schema_version = 2
+    # Unsaved changes that trigger a write before the bot is closed
+    save_threshold = 20
+
+    def __init__(self, file_name: str, max_size: int, ttl: float) -> None:
+        self.file_name = file_name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._entries: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._aliases: Dict[str, str] = {}
+        self._changes = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        try:
+            with open(self.file_name, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception:
+            logging.warning("Info cache is damaged and will be recreated")
+            return
+        if data.get("schema_version") != self.schema_version:
+            logging.info("Info cache has an outdated schema and will be recreated")
+            return
+        self._entries = data["entries"]
+        self._aliases = data["aliases"]
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._changes:
+                return
+            data = {
+                "schema_version": self.schema_version,
+                "entries": self._entries.copy(),
+                "aliases": self._aliases.copy(),
+            }
+            self._changes = 0
+        temp_file_name = self.file_name + ".tmp"
+        try:
+            with open(temp_file_name, "wb") as f:
+                pickle.dump(data, f)
+            os.replace(temp_file_name, self.file_name)
+        except OSError:
+            logging.error("Cannot save info cache", exc_info=True)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            key = self._aliases.get(url, url)
+            entry = self._entries.get(key)
+            if entry and entry[0] + self.ttl > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                # yt-dlp may alter the dicts it is given
+                return copy.deepcopy(entry[1])
+            if entry:
+                self._remove(key)
+                self._changes += 1
+            return None
+
+    def add_miss(self) -> None:
+        """Counts a lookup of something that could have been cached.
+
+        Only the caller knows whether a URL it did not find is cacheable at all.
+        """
+        with self._lock:
+            self.misses += 1
+
+    def put(self, url: str, key: str, info: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), info)
+            self._entries.move_to_end(key)
+            if url != key:
+                self._aliases[url] = key
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+            self._changes += 1
+            save = self._changes >= self.save_threshold
+        if save:
+            self.save()
+
+    def _remove(self, key: str) -> None:
+        del self._entries[key]
+        for url in [url for url, i in self._aliases.items() if i == key]:
+            del self._aliases[url]
@@ -1,22 +1,26 @@
 from __future__ import annotations
 import logging
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, Iterator, List, Optional, TYPE_CHECKING
 from urllib.parse import urlparse
 
 if TYPE_CHECKING:
     from bot import Bot
 
-import mpv
 import requests
 import vk_api
 
 from bot.config.models import VkModel
 from bot.player.track import Track
+from bot.player.track_list import LazyTrackList
 from bot.services import Service as _Service
 from bot import errors
 
 
 class VkService(_Service):
+    first_page_size = 20
+    page_size = 200
+    search_limit = 300
+
     def __init__(self, bot: Bot, config: VkModel) -> None:
         self.bot = bot
         self.config = config
@@ -40,6 +44,9 @@ class VkService(_Service):
         if ".m3u8" not in track.url:
             super().download(track, file_path)
             return
+        # libmpv is loaded only when a stream has to be recorded
+        import mpv
+
         _mpv = mpv.MPV(
             **{
                 "demuxer_lavf_o": "http_persistent=false",
@@ -53,6 +60,54 @@ class VkService(_Service):
             pass
         _mpv.terminate()
 
+    def _make_track(self, audio: Dict[str, Any]) -> Optional[Track]:
+        if "url" not in audio or not audio["url"]:
+            return None
+        return Track(
+            service=self.name,
+            url=audio["url"],
+            name="{} - {}".format(audio["artist"], audio["title"]),
+            format=self.format,
+        )
+
+    def _get_pages(
+        self,
+        method: Callable[..., Dict[str, Any]],
+        limit: Optional[int] = None,
+        **kwargs: Any,
+    ) -> LazyTrackList:
+        # A small first page lets playback start before the rest is fetched
+        audios = method(count=self.first_page_size, **kwargs)
+        if "count" not in audios or audios["count"] == 0:
+            raise errors.NothingFoundError()
+        total = audios["count"] if limit is None else min(audios["count"], limit)
+        tracks = LazyTrackList(
+            self._iterate_pages(audios, method, total, kwargs), total=total
+        )
+        if not tracks:
+            raise errors.NothingFoundError()
+        return tracks
+
+    def _iterate_pages(
+        self,
+        audios: Dict[str, Any],
+        method: Callable[..., Dict[str, Any]],
+        total: int,
+        kwargs: Dict[str, Any],
+    ) -> Iterator[Track]:
+        offset = 0
+        while True:
+            for audio in audios["items"][: total - offset]:
+                track = self._make_track(audio)
+                if track:
+                    yield track
+            offset += len(audios["items"])
+            if not audios["items"] or offset >= total:
+                break
+            audios = method(
+                count=min(self.page_size, total - offset), offset=offset, **kwargs
+            )
+
     def initialize(self) -> None:
         http = requests.Session()
         http.headers.update(
@@ -90,59 +145,34 @@ class VkService(_Service):
                 ids = id.split("_")
                 o_id = ids[0]
                 p_id = ids[1]
-                audios = self.api.audio.get(owner_id=int(o_id), album_id=int(p_id))
+                return self._get_pages(
+                    self.api.audio.get, owner_id=int(o_id), album_id=int(p_id)
+                )
             elif "audio" in path:
-                audios = {
-                    "count": 1,
-                    "items": self.api.audio.getById(audios=[path[5::]]),
-                }
-            else:
-                object_info = self.api.utils.resolveScreenName(screen_name=path)
-                if object_info["type"] == "group":
-                    id = -object_info["object_id"]
-                else:
-                    id = object_info["object_id"]
-                audios = self.api.audio.get(owner_id=id, count=6000)
-            if "count" in audios and audios["count"] > 0:
                 tracks: List[Track] = []
-                for audio in audios["items"]:
-                    if "url" not in audio or not audio["url"]:
-                        continue
-                    track = Track(
-                        service=self.name,
-                        url=audio["url"],
-                        name="{} - {}".format(audio["artist"], audio["title"]),
-                        format=self.format,
-                    )
-                    tracks.append(track)
+                for audio in self.api.audio.getById(audios=[path[5::]]):
+                    track = self._make_track(audio)
+                    if track:
+                        tracks.append(track)
                 if tracks:
                     return tracks
                 else:
                     raise errors.NothingFoundError()
             else:
-                raise errors.NothingFoundError
+                object_info = self.api.utils.resolveScreenName(screen_name=path)
+                if object_info["type"] == "group":
+                    id = -object_info["object_id"]
+                else:
+                    id = object_info["object_id"]
+                return self._get_pages(self.api.audio.get, owner_id=id)
         except NotImplementedError as e:
             print("vk get error")
             print(e)
             raise NotImplementedError()
 
     def search(self, query: str) -> List[Track]:
-        results = self.api.audio.search(q=query, count=300, sort=0)
-        if "count" in results and results["count"] > 0:
-            tracks: List[Track] = []
-            for track in results["items"]:
-                if "url" not in track or not track["url"]:
-                    continue
-                track = Track(
-                    service=self.name,
-                    url=track["url"],
-                    name="{} - {}".format(track["artist"], track["title"]),
-                    format=self.format,
-                )
-                tracks.append(track)
-            if tracks:
-                return tracks
-            else:
-                raise errors.NothingFoundError()
-        else:
-            raise errors.NothingFoundError()
+        tracks = self._get_pages(
+            self.api.audio.search, limit=self.search_limit, q=query, sort=0
+        )
+        tracks.load_in_background()
+        return tracks
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import time
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
 from urllib.parse import urlparse
 
 if TYPE_CHECKING:
@@ -14,11 +15,17 @@ from yandex_music.exceptions import UnauthorizedError, NetworkError
 from bot.config.models import YamModel
 from bot.player.enums import TrackType
 from bot.player.track import Track
+from bot.player.track_list import LazyTrackList
 from bot.services import Service
 from bot import errors
 
 
 class YamService(Service):
+    page_size = 100
+    # Track ids sent in one tracks() request
+    batch_size = 100
+    link_workers = 4
+
     def __init__(self, bot: Bot, config: YamModel):
         self.bot = bot
         self.config = config
@@ -32,6 +39,9 @@ class YamService(Service):
         self.format = ".mp3"
 
     def initialize(self):
+        self._link_executor = ThreadPoolExecutor(
+            self.link_workers, thread_name_prefix="YamLinkResolver"
+        )
         self.api = Client(token=self.config.token)
         try:
             self.api.init()
@@ -47,6 +57,95 @@ class YamService(Service):
                 "You don't have Yandex Plus"
             )
 
+    def close(self) -> None:
+        self._link_executor.shutdown(wait=False)
+
+    def load_names(self, tracks: List[Track]) -> None:
+        for track, yam_track in self._fetch_tracks(tracks):
+            track.name = self._format_name(yam_track)
+
+    def prefetch(self, tracks: List[Track]) -> None:
+        tracks = [i for i in tracks if not self._is_stream_cached(i)]
+        futures = []
+        for track, yam_track in self._fetch_tracks(tracks):
+            if not track.has_name:
+                track.name = self._format_name(yam_track)
+            futures.append(
+                self._link_executor.submit(
+                    self._cache_stream, str(track.extra_info["track_id"]), yam_track
+                )
+            )
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                logging.debug("Cannot prefetch track", exc_info=True)
+
+    def _fetch_tracks(self, tracks: List[Track]) -> Iterator[Tuple[Track, Any]]:
+        # tracks() accepts many ids, so metadata is requested in batches
+        tracks = [i for i in tracks if i.extra_info and "track_id" in i.extra_info]
+        for i in range(0, len(tracks), self.batch_size):
+            batch = tracks[i : i + self.batch_size]
+            yam_tracks = {
+                str(yam_track.id): yam_track
+                for yam_track in self.api.tracks(
+                    [track.extra_info["track_id"] for track in batch]
+                )
+            }
+            for track in batch:
+                track_id = str(track.extra_info["track_id"]).split(":")[0]
+                if track_id in yam_tracks:
+                    yield track, yam_tracks[track_id]
+
+    def _is_stream_cached(self, track: Track) -> bool:
+        id = self.get_stream_id("", track.extra_info)
+        return id is not None and (self.name, id) in self.stream_cache
+
+    def _cache_stream(self, id: str, yam_track: Any) -> None:
+        self.stream_cache.put((self.name, id), self._make_stream_track(yam_track))
+
+    def _format_name(self, yam_track: Any) -> str:
+        return "{} - {}".format(" & ".join(yam_track.artists_name()), yam_track.title)
+
+    def _make_stream_track(self, yam_track: Any) -> Track:
+        return Track(
+            service=self.name,
+            name=self._format_name(yam_track),
+            url=yam_track.get_download_info(get_direct_links=True)[0].direct_link,
+            type=TrackType.Default,
+            format=self.format,
+        )
+
+    def _make_tracks(self, track_ids: Iterable[str]) -> Iterator[Track]:
+        for track_id in track_ids:
+            yield Track(
+                service=self.name,
+                extra_info={"track_id": track_id},
+                type=TrackType.Dynamic,
+            )
+
+    def _iterate_artist_tracks(self, artist_id: str) -> Iterator[str]:
+        page = 0
+        while True:
+            artist_tracks = self.api.artists_tracks(
+                artist_id, page=page, page_size=self.page_size
+            )
+            for track in artist_tracks.tracks:
+                yield track.track_id
+            page += 1
+            if (
+                not artist_tracks.tracks
+                or page * self.page_size >= artist_tracks.pager.total
+            ):
+                break
+
+    def get_stream_id(
+        self, url: str, extra_info: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        if extra_info and "track_id" in extra_info:
+            return str(extra_info["track_id"])
+        return None
+
     def get(
         self,
         url: str,
@@ -61,90 +160,56 @@ class YamService(Service):
                 real_id = split_path[4] + ":" + split_path[2]
                 return self.get(None, extra_info={"track_id": real_id}, process=True)
             elif "/album/" in path:
-                tracks = []
                 album = self.api.albums_with_tracks(path.split("/")[2])
                 if len(album.volumes) == 0 or len(album.volumes[0]) == 0:
                     raise errors.ServiceError()
-                for volume in album.volumes:
-                    for track in volume:
-                        tracks.append(
-                            Track(
-                                service=self.name,
-                                extra_info={"track_id": track.track_id},
-                                type=TrackType.Dynamic,
-                            )
-                        )
-                return tracks
+                return LazyTrackList(
+                    self._make_tracks(
+                        track.track_id for volume in album.volumes for track in volume
+                    ),
+                    total=sum(len(volume) for volume in album.volumes),
+                )
             if "/artist/" in path:
-                tracks = []
-                artist_tracks = self.api.artists_tracks(path.split("/")[2]).tracks
-                if len(artist_tracks) == 0:
+                tracks = LazyTrackList(
+                    self._make_tracks(self._iterate_artist_tracks(path.split("/")[2]))
+                )
+                if not tracks:
                     raise errors.ServiceError()
-                for track in artist_tracks:
-                    tracks.append(
-                        Track(
-                            service=self.name,
-                            extra_info={"track_id": track.track_id},
-                            type=TrackType.Dynamic,
-                        )
-                    )
                 return tracks
             elif "users" in path and "playlist" in path:
-                tracks = []
                 split_path = path.split("/")
                 user_id = split_path[2]
                 kind = split_path[4]
                 playlist = self.api.users_playlists(kind=kind, user_id=user_id)
                 if playlist.track_count == 0:
                     raise errors.ServiceError()
-                for track in playlist.tracks:
-                    tracks.append(
-                        Track(
-                            service=self.name,
-                            extra_info={"track_id": track.track_id},
-                            type=TrackType.Dynamic,
-                        )
-                    )
-                return tracks
+                return LazyTrackList(
+                    self._make_tracks(track.track_id for track in playlist.tracks),
+                    total=playlist.track_count,
+                )
         else:
             track = self.api.tracks(extra_info["track_id"])[0]
-            return [
-                Track(
-                    service=self.name,
-                    name="{} - {}".format(
-                        " & ".join(track.artists_name()), track.title
-                    ),
-                    url=track.get_download_info(get_direct_links=True)[0].direct_link,
-                    type=TrackType.Default,
-                    format=self.format,
-                )
-            ]
+            return [self._make_stream_track(track)]
 
     def search(self, query: str) -> List[Track]:
-        tracks: List[Track] = []
         found_tracks = self.api.search(text=query, nocorrect=True, type_="all").tracks
+        # Podcast episodes are searched for while the first track already plays
+        tracks = LazyTrackList(
+            self._make_tracks(self._iterate_search(query, found_tracks))
+        )
+        if tracks:
+            tracks.load_in_background()
+            return tracks
+        else:
+            raise errors.NothingFoundError("")
+
+    def _iterate_search(self, query: str, found_tracks: Any) -> Iterator[str]:
         if found_tracks:
             for track in found_tracks.results:
-                tracks.append(
-                    Track(
-                        service=self.name,
-                        type=TrackType.Dynamic,
-                        extra_info={"track_id": track.track_id},
-                    )
-                )
+                yield track.track_id
         found_podcast_episodes = self.api.search(
             text=query, nocorrect=True, type_="podcast_episode"
         ).podcast_episodes
         if found_podcast_episodes:
             for podcast_episode in found_podcast_episodes.results:
-                tracks.append(
-                    Track(
-                        service=self.name,
-                        type=TrackType.Dynamic,
-                        extra_info={"track_id": podcast_episode.track_id},
-                    )
-                )
-        if tracks:
-            return tracks
-        else:
-            raise errors.NothingFoundError("")
+                yield podcast_episode.track_id
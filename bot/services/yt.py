@@ -1,6 +1,11 @@
 from __future__ import annotations
+from contextlib import contextmanager
 import logging
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+import os
+from queue import Empty, Full, Queue
+import re
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from bot import Bot
@@ -13,11 +18,17 @@ from bot.config.models import YtModel
 
 from bot.player.enums import TrackType
 from bot.player.track import Track
+from bot.player.track_list import LazyTrackList
 from bot.services import Service as _Service
+from bot.services.info_cache import InfoCache
 from bot import errors
 
 
 class YtService(_Service):
+    expire_pattern = re.compile(r"[?&/]expire[=/](\d+)")
+    ydl_pool_size = 4
+    search_limit = 300
+
     def __init__(self, bot: Bot, config: YtModel):
         self.bot = bot
         self.config = config
@@ -36,16 +47,137 @@ class YtService(_Service):
             "socket_timeout": 5,
             "logger": logging.getLogger("root"),
         }
+        info_cache_file_name = self.config.info_cache_file_name
+        if not os.path.dirname(info_cache_file_name):
+            info_cache_file_name = os.path.join(
+                os.path.dirname(self.bot.cache_manager.file_name),
+                info_cache_file_name,
+            )
+        self.info_cache = InfoCache(
+            info_cache_file_name, self.config.info_cache_size, self.config.info_cache_ttl
+        )
+        self._ydl_pool: Queue[YoutubeDL] = Queue(self.ydl_pool_size)
+        self._ydl_lock = Lock()
+        # Instances made because the pool was empty, lazy playlists keep
+        # theirs until they are expanded, so this may exceed the pool size
+        self.ydl_created = 0
+
+    def close(self) -> None:
+        self.info_cache.save()
+        while True:
+            try:
+                self._ydl_pool.get_nowait().close()
+            except Empty:
+                break
+
+    @property
+    def ydl_pooled(self) -> int:
+        return self._ydl_pool.qsize()
+
+    def _acquire_ydl(self) -> YoutubeDL:
+        # Setting up YoutubeDL loads every extractor, so instances are reused
+        try:
+            return self._ydl_pool.get_nowait()
+        except Empty:
+            with self._ydl_lock:
+                self.ydl_created += 1
+                created = self.ydl_created
+            logging.debug("Creating YoutubeDL instance {}".format(created))
+            return YoutubeDL(self._ydl_config)
+
+    def _release_ydl(self, ydl: YoutubeDL) -> None:
+        try:
+            self._ydl_pool.put_nowait(ydl)
+        except Full:
+            ydl.close()
+
+    @contextmanager
+    def _checkout_ydl(self) -> Iterator[YoutubeDL]:
+        ydl = self._acquire_ydl()
+        try:
+            yield ydl
+        finally:
+            self._release_ydl(ydl)
 
     def download(self, track: Track, file_path: str) -> None:
         info = track.extra_info
         if not info:
             super().download(track, file_path)
             return
-        with YoutubeDL(self._ydl_config) as ydl:
+        with self._checkout_ydl() as ydl:
             dl = get_suitable_downloader(info)(ydl, self._ydl_config)
             dl.download(file_path, info)
 
+    def compact_extra_info(
+        self, extra_info: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        url = extra_info.get("webpage_url") or extra_info.get("url")
+        if not url:
+            return extra_info
+        return {
+            "_type": "url",
+            "url": url,
+            "ie_key": extra_info.get("ie_key") or extra_info.get("extractor_key"),
+        }
+
+    def _extract_info(self, ydl: YoutubeDL, url: str) -> Dict[str, Any]:
+        info = self.info_cache.get(url)
+        if info:
+            return info
+        info = ydl.extract_info(url, process=False)
+        # Only playlists are kept, a video has to be extracted again anyway
+        # when it is resolved, so caching it would save no request
+        if info.get("_type") != "playlist":
+            return info
+        self.info_cache.add_miss()
+        ie_key = info.get("extractor_key") or info.get("ie_key")
+        if info.get("id") and ie_key:
+            key = "{}:{}".format(ie_key, info["id"])
+            info["entries"] = self._cache_playlist(url, key, info, info["entries"])
+        return info
+
+    def _cache_playlist(
+        self,
+        url: str,
+        key: str,
+        info: Dict[str, Any],
+        entries: Iterable[Dict[str, Any]],
+    ) -> Iterator[Dict[str, Any]]:
+        # A playlist is cached only after all of its entries have been seen
+        compact_entries: List[Optional[Dict[str, Any]]] = []
+        for entry in entries:
+            compact_entries.append(self.compact_extra_info(entry))
+            yield entry
+        self.info_cache.put(
+            url,
+            key,
+            {
+                "_type": "playlist",
+                "id": info.get("id"),
+                "title": info.get("title"),
+                "entries": compact_entries,
+            },
+        )
+
+    def _expand_playlist(
+        self, ydl: YoutubeDL, entries: Iterable[Dict[str, Any]]
+    ) -> Iterator[Track]:
+        for entry in entries:
+            yield from self._get(ydl, "", entry, False)
+
+    def get_stream_id(
+        self, url: str, extra_info: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        if extra_info:
+            return extra_info.get("webpage_url") or extra_info.get("url")
+        return url
+
+    def get_stream_expiry(self, track: Track) -> Optional[float]:
+        match = self.expire_pattern.search(track.url)
+        if match:
+            return float(match.group(1))
+        return None
+
     def get(
         self,
         url: str,
@@ -54,55 +186,89 @@ class YtService(_Service):
     ) -> List[Track]:
         if not (url or extra_info):
             raise errors.InvalidArgumentError()
-        with YoutubeDL(self._ydl_config) as ydl:
-            if not extra_info:
-                info = ydl.extract_info(url, process=False)
-            else:
-                info = extra_info
-            info_type = None
-            if "_type" in info:
-                info_type = info["_type"]
-            if info_type == "url" and not info["ie_key"]:
-                return self.get(info["url"], process=False)
-            elif info_type == "playlist":
-                tracks: List[Track] = []
-                for entry in info["entries"]:
-                    data = self.get("", extra_info=entry, process=False)
-                    tracks += data
-                return tracks
-            if not process:
-                return [
-                    Track(service=self.name, extra_info=info, type=TrackType.Dynamic)
-                ]
-            try:
-                stream = ydl.process_ie_result(info)
-            except Exception:
-                raise errors.ServiceError()
-            if "url" in stream:
-                url = stream["url"]
-            else:
-                raise errors.ServiceError()
-            title = stream["title"]
-            if "uploader" in stream:
-                title += " - {}".format(stream["uploader"])
-            format = stream["ext"]
-            if "is_live" in stream and stream["is_live"]:
-                type = TrackType.Live
-            else:
-                type = TrackType.Default
+        ydl = self._acquire_ydl()
+        try:
+            tracks = self._get(ydl, url, extra_info, process)
+        except Exception:
+            self._release_ydl(ydl)
+            raise
+        if isinstance(tracks, list):
+            self._release_ydl(ydl)
+            return tracks
+        # Playlists are expanded while the first entry already plays, the
+        # YoutubeDL instance is released once the expansion ends
+        track_list = LazyTrackList(self._release_after(ydl, tracks))
+        if not track_list:
+            raise errors.ServiceError()
+        track_list.load_in_background()
+        return track_list
+
+    def _release_after(
+        self, ydl: YoutubeDL, tracks: Iterable[Track]
+    ) -> Iterator[Track]:
+        try:
+            yield from tracks
+        finally:
+            self._release_ydl(ydl)
+
+    def _get(
+        self,
+        ydl: YoutubeDL,
+        url: str,
+        extra_info: Optional[Dict[str, Any]],
+        process: bool,
+    ) -> Iterable[Track]:
+        if not extra_info:
+            info = self._extract_info(ydl, url)
+        else:
+            info = extra_info
+        info_type = None
+        if "_type" in info:
+            info_type = info["_type"]
+        if info_type == "url" and not info["ie_key"]:
+            return self._get(ydl, info["url"], None, process)
+        elif info_type == "playlist":
+            return self._expand_playlist(ydl, info["entries"])
+        if not process:
             return [
-                Track(service=self.name, url=url, name=title, format=format, type=type, extra_info=stream)
+                Track(service=self.name, extra_info=info, type=TrackType.Dynamic)
             ]
+        try:
+            stream = ydl.process_ie_result(info)
+        except Exception:
+            raise errors.ServiceError()
+        if "url" in stream:
+            url = stream["url"]
+        else:
+            raise errors.ServiceError()
+        title = stream["title"]
+        if "uploader" in stream:
+            title += " - {}".format(stream["uploader"])
+        format = stream["ext"]
+        if "is_live" in stream and stream["is_live"]:
+            type = TrackType.Live
+        else:
+            type = TrackType.Default
+        return [
+            Track(service=self.name, url=url, name=title, format=format, type=type, extra_info=stream)
+        ]
 
     def search(self, query: str) -> List[Track]:
-        search = VideosSearch(query, limit=300).result()
-        if search["result"]:
-            tracks: List[Track] = []
-            for video in search["result"]:
-                track = Track(
-                    service=self.name, url=video["link"], type=TrackType.Dynamic
-                )
-                tracks.append(track)
-            return tracks
+        # limit only truncates a page, each further page is another request
+        search = VideosSearch(query, limit=self.search_limit)
+        if search.result()["result"]:
+            # Later pages are requested only when the player gets near them
+            return LazyTrackList(self._iterate_search(search))
         else:
             raise errors.NothingFoundError("")
+
+    def _iterate_search(self, search: VideosSearch) -> Iterator[Track]:
+        count = 0
+        while True:
+            for video in search.result()["result"]:
+                yield Track(
+                    service=self.name, url=video["link"], type=TrackType.Dynamic
+                )
+                count += 1
+            if count >= self.search_limit or not search.next():
+                break
@@ -1,4 +1,5 @@
 import os
+from typing import Iterator, List, Tuple
 
 from bot import app_vars
 
@@ -14,3 +15,59 @@ def clean_file_name(file_name: str) -> str:
 
 def get_abs_path(file_name: str) -> str:
     return os.path.join(app_vars.directory, file_name)
+
+
+def split(
+    text: str, max_length: int = app_vars.max_message_length
+) -> Iterator[str]:
+    """Yields chunks of text no longer than max_length bytes in UTF-8.
+
+    Lines are kept whole where they fit, longer lines are split between words
+    and words that do not fit into a chunk are split between characters.
+    """
+    if len(text.encode("utf-8")) <= max_length:
+        yield text
+        return
+    chunk: List[str] = []
+    chunk_size = 0
+    for separator, piece, piece_size in _split_pieces(text, max_length):
+        if not chunk:
+            # A separator at the start of a chunk is dropped
+            if piece:
+                chunk.append(piece)
+                chunk_size = piece_size
+        elif chunk_size + len(separator) + piece_size <= max_length:
+            chunk.append(separator)
+            chunk.append(piece)
+            chunk_size += len(separator) + piece_size
+        else:
+            yield "".join(chunk)
+            chunk = [piece] if piece else []
+            chunk_size = piece_size
+    if chunk:
+        yield "".join(chunk)
+
+
+def _split_pieces(text: str, max_length: int) -> Iterator[Tuple[str, str, int]]:
+    # Yields (separator, piece, size of piece in bytes), no piece exceeds max_length
+    separator = ""
+    for line in text.split("\n"):
+        line_size = len(line.encode("utf-8"))
+        if line_size <= max_length:
+            yield separator, line, line_size
+        else:
+            for word in line.split(" "):
+                data = word.encode("utf-8")
+                start = 0
+                while True:
+                    end = min(start + max_length, len(data))
+                    # A continuation byte never starts a character
+                    while end < len(data) and data[end] & 0xC0 == 0x80:
+                        end -= 1
+                    yield separator, data[start:end].decode("utf-8"), end - start
+                    separator = ""
+                    start = end
+                    if start >= len(data):
+                        break
+                separator = " "
+        separator = "\n"
@@ -0,0 +1,73 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from bot.config.models import YtModel
+from bot.player.track_list import LazyTrackList
+from bot.services import yt
+from bot.services.ttl_cache import TtlCache
+from bot.services.yt import YtService
+
+
+class VideosSearch:
+    pages = 3
+    page_size = 20
+    requests: List[str] = []
+
+    def __init__(self, query: str, limit: int) -> None:
+        self.query = query
+        self.page = 0
+        self.requests.append(query)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "result": [
+                {"link": "https://www.youtube.com/watch?v={}-{}".format(self.page, i)}
+                for i in range(self.page_size)
+            ]
+        }
+
+    def next(self) -> bool:
+        if self.page + 1 >= self.pages:
+            return False
+        self.page += 1
+        self.requests.append(self.query)
+        return True
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> YtService:
+    monkeypatch.setattr(yt, "VideosSearch", VideosSearch)
+    monkeypatch.setattr(VideosSearch, "requests", [])
+    service = YtService(None, YtModel())  # type: ignore
+    service.search_cache = TtlCache(10, 600)
+    return service
+
+
+def test_repeated_query_is_cache_hit(service: YtService) -> None:
+    first = service.search_cached("Some query")
+    second = service.search_cached("  some   QUERY ")
+    assert VideosSearch.requests == ["Some query"]
+    assert service.search_cache.hits == 1
+    assert [i.get_record() for i in second] == [i.get_record() for i in first]
+
+
+def test_later_pages_are_requested_once(service: YtService) -> None:
+    first = service.search_cached("query")
+    assert isinstance(first, LazyTrackList)
+    assert first.load(VideosSearch.page_size)
+    second = service.search_cached("query")
+    assert isinstance(second, LazyTrackList)
+    assert second.load(VideosSearch.page_size)
+    assert len(VideosSearch.requests) == 2
+    second.load_all()
+    assert len(second) == VideosSearch.pages * VideosSearch.page_size
+    assert len(VideosSearch.requests) == VideosSearch.pages
+
+
+def test_callers_get_copies(service: YtService) -> None:
+    first = service.search_cached("query")
+    first[0].extra_info = {"resolved": True}
+    second = service.search_cached("query")
+    assert second[0] is not first[0]
+    assert second[0].extra_info is None
@@ -0,0 +1,44 @@
+import re
+
+from hypothesis import given, strategies as st
+
+from bot.utils import split
+
+re_separators = re.compile("[ \n]")
+
+texts = st.text(alphabet=st.sampled_from(["a", "b", " ", "\n", "ж", "中", "😀"]))
+max_lengths = st.integers(min_value=4, max_value=64)
+
+
+@given(texts, max_lengths)
+def test_chunks_fit_in_max_length(text: str, max_length: int) -> None:
+    for chunk in split(text, max_length):
+        assert len(chunk.encode("utf-8")) <= max_length
+
+
+@given(texts, max_lengths)
+def test_text_is_kept_in_order(text: str, max_length: int) -> None:
+    chunks = list(split(text, max_length))
+    assert re_separators.sub("", "".join(chunks)) == re_separators.sub("", text)
+
+
+@given(texts, max_lengths)
+def test_text_that_fits_is_not_split(text: str, max_length: int) -> None:
+    if len(text.encode("utf-8")) <= max_length:
+        assert list(split(text, max_length)) == [text]
+
+
+def test_lines_are_joined_where_they_fit() -> None:
+    assert list(split("aaa\nbbb\nccc", 7)) == ["aaa\nbbb", "ccc"]
+
+
+def test_long_lines_are_split_between_words() -> None:
+    assert list(split("first second third", 12)) == ["first second", "third"]
+
+
+def test_first_word_of_long_line_is_kept() -> None:
+    assert list(split("first " + "x" * 10, 8)) == ["first", "xxxxxxxx", "xx"]
+
+
+def test_multibyte_characters_are_not_cut() -> None:
+    assert list(split("жжжжж", 5)) == ["жж", "жж", "ж"]
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Measures cache save latency as a user's favorites grow.
+
+A track change appends one journal record and flushes it. This is compared
+with writing the whole cache, which is what every save did before the
+journal and what a compaction still does.
+"""
+
+from argparse import ArgumentParser
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.cache import CacheManager
+from bot.player.track import Track
+
+
+def make_track(number: int) -> Track:
+    return Track(
+        service="yt",
+        url="https://www.youtube.com/watch?v={:011d}".format(number),
+        name="Artist {0} - Track {0}".format(number),
+        format="m4a",
+    )
+
+
+def measure(action: Callable[[], None], repeat: int) -> List[float]:
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 50000],
+        help="Numbers of favorites to measure with",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        cache_manager = CacheManager(os.path.join(directory, "TTMediaBotCache.dat"))
+        # Compactions are measured separately
+        cache_manager.max_journal_records = sys.maxsize
+        favorites = 0
+        for size in args.sizes:
+            for number in range(favorites, size):
+                cache_manager.cache.add_favorite("user", make_track(number))
+            favorites = size
+            cache_manager.save()
+
+            def change_track() -> None:
+                cache_manager.add_recent(make_track(0))
+                cache_manager.flush()
+
+            journal_times = measure(change_track, args.repeat)
+            snapshot_times = measure(cache_manager.save, args.repeat)
+            print(
+                "{size} favorites: track change {journal:.3f} ms, "
+                "whole cache {snapshot:.3f} ms".format(
+                    size=size,
+                    journal=statistics.median(journal_times) * 1000,
+                    snapshot=statistics.median(snapshot_times) * 1000,
+                )
+            )
+        cache_manager.close()
+
+
+if __name__ == "__main__":
+    main()
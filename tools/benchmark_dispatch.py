@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Measures idle wakeups and message dispatch latency of the bot's main loop.
+
+Bot.run is driven with stand-ins for the player, the connector and the
+command processor, and compared with the polling loop it replaced, which
+checked the message queue and slept for loop_timeout between checks.
+"""
+
+from argparse import ArgumentParser
+import os
+from queue import Empty, Queue
+import random
+import statistics
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import Bot, app_vars
+
+
+class CountingQueue(Queue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.wakeups = 0
+
+    def get(self, block: bool = True, timeout: Any = None) -> Any:
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.wakeups += 1
+
+
+class CommandProcessor:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+
+    def run(self) -> None:
+        pass
+
+    def __call__(self, message: Any) -> None:
+        self.latencies.append(time.perf_counter() - message.sent_at)
+
+
+def make_bot() -> Any:
+    bot = SimpleNamespace(
+        player=SimpleNamespace(run=lambda: None),
+        tt_player_connector=SimpleNamespace(start=lambda: None),
+        command_processor=CommandProcessor(),
+        ttclient=SimpleNamespace(message_queue=CountingQueue()),
+    )
+    return bot
+
+
+def polling_run(bot: Any) -> None:
+    bot._close = False
+    while not bot._close:
+        try:
+            message = bot.ttclient.message_queue.get_nowait()
+            bot.command_processor(message)
+        except Empty:
+            pass
+        time.sleep(app_vars.loop_timeout)
+
+
+def stop_polling(bot: Any) -> None:
+    bot._close = True
+
+
+def stop_blocking(bot: Any) -> None:
+    bot._close = True
+    bot.ttclient.message_queue.put(None)
+
+
+def measure(
+    name: str,
+    run: Callable[[Any], None],
+    stop: Callable[[Any], None],
+    idle_time: float,
+    messages: int,
+) -> None:
+    bot = make_bot()
+    thread = threading.Thread(target=run, args=(bot,), daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    message_queue = bot.ttclient.message_queue
+    wakeups = message_queue.wakeups
+    time.sleep(idle_time)
+    idle_wakeups = (message_queue.wakeups - wakeups) / idle_time
+    for _ in range(messages):
+        # Irregular intervals, so messages do not line up with a polling period
+        time.sleep(random.uniform(0, 0.02))
+        message_queue.put(
+            SimpleNamespace(
+                text="p",
+                user=SimpleNamespace(username="user"),
+                sent_at=time.perf_counter(),
+            )
+        )
+    time.sleep(0.1)
+    stop(bot)
+    thread.join()
+    latencies = sorted(bot.command_processor.latencies)
+    print(
+        "{name}: {wakeups:.1f} idle wakeups/s, latency mean {mean:.3f} ms, "
+        "p95 {p95:.3f} ms, max {max:.3f} ms".format(
+            name=name,
+            wakeups=idle_wakeups,
+            mean=statistics.mean(latencies) * 1000,
+            p95=latencies[int(len(latencies) * 0.95)] * 1000,
+            max=latencies[-1] * 1000,
+        )
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--idle", type=float, default=2, help="Seconds to measure idle wakeups"
+    )
+    parser.add_argument(
+        "--messages", type=int, default=200, help="Number of messages to dispatch"
+    )
+    args = parser.parse_args()
+    measure("Polling loop", polling_run, stop_polling, args.idle, args.messages)
+    measure("Bot.run", Bot.run, stop_blocking, args.idle, args.messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Measures how many TeamTalk events are decoded per second.
+
+Synthetic TTMessage objects are decoded by TeamTalk.get_event, reading only
+the fields the event thread reads for each event type, and compared with
+decoding every field of every event as get_event used to do. The SDK
+client is replaced by a stand-in, so no server is needed.
+"""
+
+from argparse import ArgumentParser
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.TeamTalk import TeamTalk, _str
+from bot.TeamTalk.access_list import AccessList
+from bot.TeamTalk.directory import Directory
+from bot.TeamTalk.structs import Event, EventType
+
+import TeamTalkPy
+
+
+def make_user(id: int) -> TeamTalkPy.User:
+    user = TeamTalkPy.User()
+    user.nUserID = id
+    user.szNickname = _str("Nickname {}".format(id))
+    user.szUsername = _str("user{}".format(id))
+    user.szStatusMsg = _str("Status")
+    user.szClientName = _str("TeamTalk")
+    user.nChannelID = 1
+    return user
+
+
+def make_channel(id: int) -> TeamTalkPy.Channel:
+    channel = TeamTalkPy.Channel()
+    channel.nChannelID = id
+    channel.szName = _str("Channel {}".format(id))
+    channel.szTopic = _str("Topic")
+    return channel
+
+
+def make_client(users: int) -> TeamTalk:
+    ttclient = TeamTalk.__new__(TeamTalk)
+    ttclient.tt = SimpleNamespace(
+        getUser=make_user,
+        getChannel=make_channel,
+        getErrorMessage=lambda error_no: _str("Error"),
+    )
+    ttclient.directory = Directory()
+    ttclient.admins = AccessList(["admin", "type:admin"])
+    ttclient.banned_users = AccessList(["guest*"])
+    for id in range(1, users + 1):
+        ttclient.directory.update_user(ttclient.get_user_from_obj(make_user(id)))
+    return ttclient
+
+
+def make_messages(count: int, users: int) -> List[TeamTalkPy.TTMessage]:
+    event_types = [
+        EventType.USER_UPDATE,
+        EventType.STATE_CHANGE,
+        EventType.USER_UPDATE,
+        EventType.STATE_CHANGE,
+        EventType.USER_TEXT_MESSAGE,
+        EventType.SUCCESS,
+    ]
+    messages: List[TeamTalkPy.TTMessage] = []
+    for i in range(count):
+        msg = TeamTalkPy.TTMessage()
+        msg.nClientEvent = event_types[i % len(event_types)].value
+        msg.nSource = i % users + 1
+        if msg.nClientEvent == EventType.USER_TEXT_MESSAGE.value:
+            msg.textmessage.nMsgType = 1
+            msg.textmessage.nFromUserID = msg.nSource
+            msg.textmessage.szMessage = _str("p query")
+        else:
+            msg.user = make_user(msg.nSource)
+        messages.append(msg)
+    return messages
+
+
+def decode_eagerly(event: Event) -> None:
+    event.channel
+    event.error
+    event.file
+    event.user_account
+    event.user
+    event.message
+
+
+def decode_lazily(event: Event) -> None:
+    # The fields the event thread reads for these event types
+    if event.event_type in (EventType.USER_UPDATE, EventType.STATE_CHANGE):
+        event.user
+    elif event.event_type == EventType.USER_TEXT_MESSAGE:
+        event.message
+
+
+def measure(
+    name: str,
+    ttclient: TeamTalk,
+    messages: List[TeamTalkPy.TTMessage],
+    decode: Callable[[Event], Any],
+) -> None:
+    start = time.perf_counter()
+    for msg in messages:
+        decode(ttclient.get_event(msg))
+    elapsed = time.perf_counter() - start
+    print("{}: {:.0f} events/s".format(name, len(messages) / elapsed))
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+    ttclient = make_client(args.users)
+    messages = make_messages(args.events, args.users)
+    measure("Every field", ttclient, messages, decode_eagerly)
+    measure("Fields of the event type", ttclient, messages, decode_lazily)
+
+
+if __name__ == "__main__":
+    main()
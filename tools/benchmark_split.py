@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Measures throughput of the message splitter on growing replies.
+
+Throughput that stays flat as the text grows shows that splitting takes
+linear time.
+"""
+
+from argparse import ArgumentParser
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils import split
+
+samples = {
+    "Latin": "{number}: Artist {number} - Track title {number}\n",
+    "Cyrillic": "{number}: Исполнитель {number} - Название трека {number}\n",
+    "Long words": "{number}" + "x" * 200 + " ",
+}
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="Numbers of lines of each sample to split",
+    )
+    args = parser.parse_args()
+    for name, line in samples.items():
+        for size in args.sizes:
+            text = "".join(line.format(number=i) for i in range(size))
+            data_size = len(text.encode("utf-8"))
+            start = time.perf_counter()
+            chunks = sum(1 for _ in split(text))
+            elapsed = time.perf_counter() - start
+            print(
+                "{name}, {size:.2f} MB: {chunks} chunks, {speed:.1f} MB/s".format(
+                    name=name,
+                    size=data_size / 1e6,
+                    chunks=chunks,
+                    speed=data_size / 1e6 / elapsed,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
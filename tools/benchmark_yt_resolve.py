@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Measures per-track resolve latency of the YouTube service.
+
+Tracks are served by a local HTTP server and resolved through
+YtService.get, once with YoutubeDL instances reused from the service's
+pool and once with a new instance for every call, as the service did
+before the pool.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import os
+import statistics
+import sys
+import tempfile
+from threading import Thread
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.config.models import YtModel
+from bot.services.yt import YtService
+
+
+class TrackHandler(BaseHTTPRequestHandler):
+    data = b"\0" * 4096
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mp4")
+        self.send_header("Content-Length", str(len(self.data)))
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        self.do_HEAD()
+        self.wfile.write(self.data)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def resolve(service: YtService, url: str, pooled: bool) -> float:
+    start = time.perf_counter()
+    service.get(url, process=True)
+    elapsed = time.perf_counter() - start
+    if not pooled:
+        # Without the pool every call set up and threw away its own instance
+        service.close()
+    return elapsed
+
+
+def measure(
+    service: YtService, urls: List[str], pooled: bool, threads: int
+) -> List[float]:
+    with ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(lambda url: resolve(service, url, pooled), urls))
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--tracks", type=int, default=50)
+    parser.add_argument(
+        "--threads", type=int, default=1, help="Number of concurrent resolvers"
+    )
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TrackHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    urls = [
+        "http://127.0.0.1:{}/track{}.m4a".format(server.server_port, i)
+        for i in range(args.tracks)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        config = YtModel(
+            info_cache_file_name=os.path.join(directory, "TTMediaBotYtCache.dat")
+        )
+        for name, pooled in (("New instance per call", False), ("Pooled", True)):
+            service = YtService(None, config)  # type: ignore
+            service.initialize()
+            # The first call pays for setting up an instance either way
+            resolve(service, urls[0], pooled)
+            times = measure(service, urls, pooled, args.threads)
+            print(
+                "{name}: median {median:.1f} ms, mean {mean:.1f} ms per track".format(
+                    name=name,
+                    median=statistics.median(times) * 1000,
+                    mean=statistics.mean(times) * 1000,
+                )
+            )
+            service.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
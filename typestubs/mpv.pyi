@@ -35,6 +35,15 @@ class MpvEvent(Structure):
         ("data", c_void_p),
     ]
 
+class MpvEventEndFile(Structure):
+    _fields_ = [("reason", c_int), ("error", c_int)]
+    EOF: int
+    RESTARTED: int
+    ABORTED: int
+    QUIT: int
+    ERROR: int
+    REDIRECT: int
+
 class MPV:
     def __init__(
         self,
@@ -50,10 +59,16 @@ class MPV:
     duration: float
     def event_callback(
         self, *event_types: str
-    ) -> Callable[[Callable[[MpvEvent], None]], None]: ...
+    ) -> Callable[[Callable[[Dict[str, Any]], None]], None]: ...
     media_title: str
     metadata: Dict[str, Any]
+    def observe_property(
+        self, name: str, handler: Callable[[str, Any], None]
+    ) -> None: ...
     pause: bool
+    def playlist_append(self, filename: str, **options: Any) -> None: ...
+    playlist_pos: Optional[int]
+    def playlist_remove(self, index: int | str = ...) -> None: ...
     def seek(
         self, amount: float, reference: str = ..., precision: str = ...
     ) -> None: ...
@@ -5,3 +5,4 @@ class VideosSearch:
         self, query: str, limit: int = ..., language: str = ..., region: str = ...
     ) -> None: ...
     def result(self, mode: int = ...) -> Dict[str, Any]: ...
+    def next(self) -> bool: ...
@@ -7,6 +7,7 @@ class YoutubeDL:
     ) -> None: ...
     def __enter__(self) -> YoutubeDL: ...
     def __exit__(self) -> None: ...
+    def close(self) -> None: ...
     def extract_info(
         self,
         url: Optional[str],